@@ -0,0 +1,38 @@
+import copy
+
+from werewolf.engine import GameEngine, create_default_game
+from werewolf.models import Phase
+from werewolf.simulator import GameSimulator, _PHASE_HANDLERS
+from werewolf.strategy import SimpleStrategy
+
+
+def _engine_after(seed, player_count, phases):
+    state, rng = create_default_game(seed=seed, player_count=player_count)
+    engine = GameEngine({p.player_id: p.role for p in state.players}, config=state.config)
+    engine.state = state
+    engine.rng = rng
+    simulator = GameSimulator(engine)
+    strategy = SimpleStrategy(rng)
+    for _ in range(phases):
+        if state.phase is Phase.GAME_OVER:
+            break
+        _PHASE_HANDLERS[state.phase](simulator, state, strategy)
+    return engine
+
+
+def test_copy_cheap_plays_out_like_deepcopy():
+    for seed in range(10):
+        engine = _engine_after(seed, 12, phases=seed % 6 + 1)
+        before = engine.state.snapshot()
+        rng_before = engine.rng.getstate()
+
+        cheap = engine.copy_cheap()
+        deep = copy.deepcopy(engine)
+        GameSimulator(cheap).run()
+        GameSimulator(deep).run()
+
+        assert cheap.state.history == deep.state.history
+        assert cheap.state.winner == deep.state.winner
+        # The original game is left untouched
+        assert engine.state.snapshot() == before
+        assert engine.rng.getstate() == rng_before
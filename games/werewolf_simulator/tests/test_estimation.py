@@ -0,0 +1,18 @@
+import random
+
+from werewolf.engine import create_default_game
+from werewolf.estimation import WinRateEstimator
+from werewolf.models import Role
+
+
+def test_estimate_seer_with_more_good_checks_than_villagers():
+    # 6 players hold only 2 Villagers; each "good" check is fixed as a Villager
+    # placeholder, so the third one finds the pool already empty.
+    state, _ = create_default_game(seed=0, player_count=6)
+    seer = state.players_by_role[Role.SEER][0]
+    good = [pid for pid, role in state.roles_by_id.items() if role != Role.WOLF and pid != seer]
+    state.private_info[seer].seer_results = {pid: False for pid in good[:3]}
+
+    random.seed(0)
+    rate = WinRateEstimator(num_simulations=50).estimate(state, seer)
+    assert 0.0 <= rate <= 1.0
@@ -0,0 +1,6 @@
+from werewolf.simulator import run_batch
+
+
+def test_run_batch_matches_serial():
+    seeds = list(range(12))
+    assert run_batch(seeds, workers=2) == run_batch(seeds, workers=1)
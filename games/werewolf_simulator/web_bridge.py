@@ -1,16 +1,23 @@
 import json
 import random
+import re
 from werewolf.engine import GameEngine, create_default_game
 from werewolf.simulator import GameSimulator
 from werewolf.models import Role, Phase
 from werewolf.logger import GameLogger
 
+_SAVED_RE = re.compile(r"救了\s*(\d+)")
+_PUBLIC_PHASES = frozenset({Phase.DAY_VOTE.value, Phase.DAY_DISCUSS.value, Phase.GAME_OVER.value})
+_WOLF = Role.WOLF.name  # Roles are stored by name in store.roles
+
 # Global state
 class GameStore:
     def __init__(self):
         self.simulator = None
         self.game_history = []
         self.roles = {}
+        self.player_states_by_step = []
+        self.visible_roles_by_viewer = {}
 
 store = GameStore()
 
@@ -50,9 +57,12 @@ def new_game(seed, player_count):
         store.simulator.run()
         
         store.game_history = store.simulator.history
-        store.roles = {pid: role.value for pid, role in roles.items()}
+        store.roles = {pid: role.name for pid, role in roles.items()}
+        normalize_history(store.game_history)
+        store.player_states_by_step = build_player_states(store.game_history, store.roles.keys())
+        store.visible_roles_by_viewer = build_visible_roles(store.roles)
         
-        winner = store.simulator.engine.state.winner.value if store.simulator.engine.state.winner else None
+        winner = store.simulator.engine.state.winner.name if store.simulator.engine.state.winner else None
         
         return {
             "seed": seed,
@@ -63,97 +73,108 @@ def new_game(seed, player_count):
     except Exception as e:
         return {"error": str(e)}
 
+def normalize_history(history):
+    """Rewrite each statement's claimed_role to a plain string, once per game."""
+    for evt in history:
+        stmt = evt.get('statement')
+        if not stmt:
+            continue
+        claimed_role = stmt.get('claimed_role')
+        # Enum handling if needed (unlikely if history is serialized, but safe to check)
+        if isinstance(claimed_role, dict):
+            stmt['claimed_role'] = claimed_role.get('value', claimed_role)
+        elif hasattr(claimed_role, 'name'):
+            stmt['claimed_role'] = claimed_role.name
+
+def build_player_states(history, player_ids):
+    """Replay history once; entry i is the player_states shown at step i."""
+    player_states = {pid: {"alive": True, "death_reason": None, "tags": []} for pid in player_ids}
+    # Membership mirror of each "tags" list, which keeps display order
+    tag_sets = {pid: set() for pid in player_states}
+    states_by_step = []
+    
+    for evt in history:
+        # Check for death events (tagged by the engine / simulator when recorded)
+        reason = evt.get('death_cause')
+        if reason:
+            # In history, target_id is int
+            # player_states keys are int
+            tid = evt.get('target_id')
+            if tid in player_states:
+                player_states[tid]["alive"] = False
+                player_states[tid]["death_reason"] = reason
+        
+        # Check for Claims
+        stmt = evt.get('statement')
+        if stmt:
+            actor_id = stmt.get('actor_id')
+            
+            claimed_role = stmt.get('claimed_role')  # Normalized by normalize_history()
+            claimed_checks = stmt.get('claimed_checks', {})
+            content = stmt.get('content', "")
+
+            # Seer Claims
+            if claimed_role == "SEER" and claimed_checks:
+                for target, is_wolf in claimed_checks.items():
+                    tag_type = "查杀" if is_wolf else "金水"
+                    tag = f"{tag_type}({actor_id})"
+                    target_id = int(target)
+                    if target_id in player_states and tag not in tag_sets[target_id]:
+                        tag_sets[target_id].add(tag)
+                        player_states[target_id]["tags"].append(tag)
+            
+            # Witch Claims
+            if claimed_role == "WITCH":
+                match_save = _SAVED_RE.search(content)
+                if match_save:
+                    target = int(match_save.group(1))
+                    tag = f"银水({actor_id})"
+                    if target in player_states and tag not in tag_sets[target]:
+                        tag_sets[target].add(tag)
+                        player_states[target]["tags"].append(tag)
+        
+        states_by_step.append({pid: {"alive": ps["alive"], "death_reason": ps["death_reason"], "tags": list(ps["tags"])} for pid, ps in player_states.items()})
+    
+    return states_by_step
+
+def build_visible_roles(roles):
+    """Roles each player may see: their own, plus every wolf if they are a wolf."""
+    wolves = {pid: role for pid, role in roles.items() if role == _WOLF}
+    visible_roles_by_viewer = {}
+    for pid, role in roles.items():
+        visible = {pid: role}
+        if role == _WOLF:
+            visible.update(wolves)
+        visible_roles_by_viewer[pid] = visible
+    return visible_roles_by_viewer
+
 def get_game_step(step_index, view_player_id=None):
     try:
         step_index = int(step_index)
-        if not store.simulator or not store.game_history:
+        history = store.game_history
+        if not store.simulator or not history:
             return {"error": "Game not initialized"}
             
-        if step_index < 0 or step_index >= len(store.game_history):
+        if step_index < 0 or step_index >= len(history):
             return {"error": "Step index out of range"}
             
-        current_event = store.game_history[step_index]
+        current_event = history[step_index]
         
-        # Calculate alive status
-        player_states = {pid: {"alive": True, "death_reason": None, "tags": []} for pid in store.roles.keys()}
-        
-        for i in range(step_index + 1):
-            evt = store.game_history[i]
-            # Check for death events
-            if evt.get('target_id') is not None:
-                tid = evt['target_id']
-                desc = evt.get('description', '')
-                
-                reason = None
-                if desc == "猎人开枪":
-                    reason = "HUNTER"
-                elif desc.startswith("投票结果：放逐玩家") or desc == "放逐了玩家":
-                    reason = "VOTE"
-                elif desc == "夜晚击杀生效":
-                    reason = "WOLF"
-                elif desc == "女巫使用了毒药":
-                    reason = "WITCH"
-                
-                if reason:
-                    # In history, target_id is int
-                    # player_states keys are int
-                    if tid in player_states:
-                        player_states[tid]["alive"] = False
-                        player_states[tid]["death_reason"] = reason
-            
-            # Check for Claims
-            stmt = evt.get('statement')
-            if stmt:
-                actor_id = stmt.get('actor_id')
-                
-                claimed_role = stmt.get('claimed_role')
-                claimed_checks = stmt.get('claimed_checks', {})
-                content = stmt.get('content', "")
-                
-                # Enum handling if needed (unlikely if history is serialized, but safe to check)
-                if isinstance(claimed_role, dict):
-                     claimed_role = claimed_role.get('value', claimed_role)
-                elif hasattr(claimed_role, 'value'):
-                     claimed_role = claimed_role.value
-
-                # Seer Claims
-                if claimed_role == "SEER" and claimed_checks:
-                    for target, is_wolf in claimed_checks.items():
-                        tag_type = "查杀" if is_wolf else "金水"
-                        tag = f"{tag_type}({actor_id})"
-                        target_id = int(target)
-                        if target_id in player_states and tag not in player_states[target_id]["tags"]:
-                            player_states[target_id]["tags"].append(tag)
-                
-                # Witch Claims
-                if claimed_role == "WITCH":
-                    import re
-                    match_save = re.search(r"救了\s*(\d+)", content)
-                    if match_save:
-                        target = int(match_save.group(1))
-                        tag = f"银水({actor_id})"
-                        if target in player_states and tag not in player_states[target]["tags"]:
-                            player_states[target]["tags"].append(tag)
+        player_states = store.player_states_by_step[step_index]
         
         # Determine visibility
         visible_event = filter_event_for_player(current_event, view_player_id)
         
         # Filter roles based on view
-        visible_roles = {}
         if view_player_id is None or view_player_id == -1:
             visible_roles = store.roles
         else:
-            visible_roles[view_player_id] = store.roles[view_player_id]
-            my_role = store.roles[view_player_id]
-            if my_role == Role.WOLF.value:
-                for pid, role in store.roles.items():
-                    if role == Role.WOLF.value:
-                        visible_roles[pid] = role
+            visible_roles = store.visible_roles_by_viewer[view_player_id]
             
         return {
             "step_index": step_index,
             "event": visible_event,
-            "total_steps": len(store.game_history),
+            "total_steps": len(history),
             "roles": visible_roles,
             "player_states": player_states
         }
@@ -170,14 +191,14 @@ def filter_event_for_player(event, player_id):
     is_visible = False
     
     # Public phases
-    if phase in [Phase.DAY_VOTE.value, Phase.DAY_DISCUSS.value, Phase.GAME_OVER.value]:
+    if phase in _PUBLIC_PHASES:
         is_visible = True
     elif actor == player_id:
         is_visible = True
     else:
         my_role = store.roles.get(player_id)
         actor_role = store.roles.get(actor) if actor is not None else None
-        if my_role == Role.WOLF.value and actor_role == Role.WOLF.value:
+        if my_role == _WOLF and actor_role == _WOLF:
             is_visible = True
 
     if not is_visible:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass, field, replace
 from typing import Dict, List, Optional, Tuple
 import random
@@ -20,7 +21,7 @@ from .models import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class GameEngine:
     roles: Dict[int, Role]
     config: Optional[GameConfig] = None
@@ -56,48 +57,55 @@ class GameEngine:
             # This is fallback.
             self.config = GameConfig(
                 player_count=len(players),
-                roles={r: list(self.roles.values()).count(r) for r in set(self.roles.values())},
-                victory_condition="side_slaughter" if len(players) >= 9 else "side_slaughter" # Simplified
+                roles=dict(Counter(self.roles.values())),
+                victory_condition="side_slaughter" # Simplified
             )
 
         self.state = GameState(players=players, day=1, phase=Phase.NIGHT_WOLF, private_info=private_info, config=self.config)
 
+    def copy_cheap(self) -> GameEngine:
+        # Independent copy of the game and its rng via GameState.snapshot();
+        # skips __post_init__, which would deal a fresh state only to replace it.
+        engine = object.__new__(GameEngine)
+        engine.roles = self.roles
+        engine.config = self.config
+        engine.state = GameState.from_snapshot(self.state.snapshot())
+        engine.rng = random.Random()
+        engine.rng.setstate(self.rng.getstate())
+        return engine
+
+# player_count -> (roles before shuffling, victory condition)
+_ROLE_TEMPLATES: Dict[int, Tuple[Tuple[Role, ...], str]] = {
+    # 2 Wolves, 2 Villagers, 1 Seer, 1 Witch
+    # Usually kill all villagers or all gods (but here simplified)
+    6: ((Role.WOLF,) * 2 + (Role.VILLAGER,) * 2 + (Role.SEER, Role.WITCH), "city_slaughter"),
+    # 3 Wolves, 3 Villagers, 3 Gods (Seer, Witch, Hunter)
+    9: ((Role.WOLF,) * 3 + (Role.VILLAGER,) * 3 + (Role.SEER, Role.WITCH, Role.HUNTER), "side_slaughter"),
+    # 4 Wolves, 4 Villagers, 4 Gods (Seer, Witch, Hunter, Guard/Villager)
+    # Standard: Seer, Witch, Hunter, Idiot/Guard. We don't have Guard yet, so 5 Villagers for now.
+    12: ((Role.WOLF,) * 4 + (Role.VILLAGER,) * 5 + (Role.SEER, Role.WITCH, Role.HUNTER), "side_slaughter"),
+    # 5 Wolves, 5 Villagers, 5 Gods
+    15: ((Role.WOLF,) * 5 + (Role.VILLAGER,) * 5 + (Role.SEER, Role.WITCH, Role.HUNTER, Role.VILLAGER, Role.VILLAGER), "side_slaughter"),
+}
+# Other player counts fall back to the 6-player roles
+_FALLBACK_TEMPLATE = (_ROLE_TEMPLATES[6][0], "side_slaughter")
+_ROLE_COUNTS: Dict[Tuple[Role, ...], Dict[Role, int]] = {
+    template: dict(Counter(template)) for template, _ in _ROLE_TEMPLATES.values()
+}
+
 def create_default_game(seed: Optional[int] = None, player_count: int = 6) -> Tuple[GameState, random.Random]:
     rng = random.Random(seed)
     
     # Configuration Logic
-    roles_list = []
-    victory_condition = "side_slaughter"
-    
-    if player_count == 6:
-        # 2 Wolves, 2 Villagers, 1 Seer, 1 Witch
-        roles_list = [Role.WOLF]*2 + [Role.VILLAGER]*2 + [Role.SEER, Role.WITCH]
-        victory_condition = "city_slaughter" # Usually kill all villagers or all gods (but here simplified)
-    elif player_count == 9:
-        # 3 Wolves, 3 Villagers, 3 Gods (Seer, Witch, Hunter)
-        roles_list = [Role.WOLF]*3 + [Role.VILLAGER]*3 + [Role.SEER, Role.WITCH, Role.HUNTER]
-        victory_condition = "side_slaughter"
-    elif player_count == 12:
-        # 4 Wolves, 4 Villagers, 4 Gods (Seer, Witch, Hunter, Guard/Villager)
-        # For MVP, let's use 4 Villagers + Seer, Witch, Hunter, Hunter (or another Villager)
-        # Standard: Seer, Witch, Hunter, Idiot/Guard. We don't have Guard yet. Use Villager as placeholder or add Guard later.
-        # Let's use 5 Villagers for now.
-        roles_list = [Role.WOLF]*4 + [Role.VILLAGER]*5 + [Role.SEER, Role.WITCH, Role.HUNTER]
-        victory_condition = "side_slaughter"
-    elif player_count == 15:
-        # 5 Wolves, 5 Villagers, 5 Gods
-        roles_list = [Role.WOLF]*5 + [Role.VILLAGER]*5 + [Role.SEER, Role.WITCH, Role.HUNTER, Role.VILLAGER, Role.VILLAGER]
-        victory_condition = "side_slaughter"
-    else:
-        # Fallback to 6
-        roles_list = [Role.WOLF]*2 + [Role.VILLAGER]*2 + [Role.SEER, Role.WITCH]
-
+    template, victory_condition = _ROLE_TEMPLATES.get(player_count, _FALLBACK_TEMPLATE)
+    # shuffle() and sample() draw different permutations from the same seed; this uses shuffle()
+    roles_list = list(template)
     rng.shuffle(roles_list)
     roles = {i: role for i, role in enumerate(roles_list)}
     
     config = GameConfig(
         player_count=player_count,
-        roles={r: roles_list.count(r) for r in set(roles_list)},
+        roles=dict(_ROLE_COUNTS[template]),
         victory_condition=victory_condition
     )
     
@@ -111,15 +119,19 @@ def create_default_game(seed: Optional[int] = None, player_count: int = 6) -> Tu
 
 
 def alive_players(state: GameState) -> List[Player]:
-    return [p for p in state.players if p.alive]
+    # Snapshot list, shared by every caller until the next death: do not mutate it.
+    if state.alive_snapshot_deaths != state.deaths:
+        state.alive_snapshot = [p for p in state.players if p.alive]
+        state.alive_snapshot_deaths = state.deaths
+    return state.alive_snapshot
 
 
 def get_player(state: GameState, player_id: int) -> Player:
-    return next(p for p in state.players if p.player_id == player_id)
+    return state.players_by_id[player_id]
 
 
 def role_of(state: GameState, player_id: int) -> Role:
-    return get_player(state, player_id).role
+    return state.roles_by_id[player_id]
 
 
 def faction_of(role: Role) -> Faction:
@@ -127,23 +139,59 @@ def faction_of(role: Role) -> Faction:
 
 
 def check_winner(state: GameState) -> Optional[Faction]:
-    alive = alive_players(state)
-    wolves = [p for p in alive if p.role == Role.WOLF]
-    villagers = [p for p in alive if p.role != Role.WOLF]
-    if not wolves:
+    if state.alive_wolves == 0:
         return Faction.VILLAGE
-    if len(wolves) >= len(villagers):
+    if state.alive_wolves >= state.alive_villagers:
         return Faction.WOLF
     return None
 
 
-def record_event(state: GameState, description: str, actor_id: Optional[int] = None, target_id: Optional[int] = None, recommendation: Optional[Recommendation] = None, statement: Optional[Statement] = None, votes: Optional[Dict[str, int]] = None, vote_reasons: Optional[Dict[str, str]] = None) -> None:
+def record_event(state: GameState, description: str, actor_id: Optional[int] = None, target_id: Optional[int] = None, recommendation: Optional[Recommendation] = None, statement: Optional[Statement] = None, votes: Optional[Dict[int, int]] = None, vote_reasons: Optional[Dict[int, str]] = None, death_cause: Optional[str] = None) -> None:
     # Capture trust scores snapshot
-    trust_snapshot = {}
-    for pid, p_info in state.private_info.items():
-        trust_snapshot[pid] = dict(p_info.trust_scores)
+    # Copy-on-write snapshot: rows (and the whole map) that did not change
+    # since the previous event are shared with it, so events are immutable once
+    # recorded. Only observers flagged trust_dirty get a fresh row.
+    private_info = state.private_info
+    previous = state.trust_snapshot
+    trust_snapshot = previous
+    if len(previous) != len(private_info) or any(p_info.trust_dirty for p_info in private_info.values()):
+        trust_snapshot = {}
+        for pid, p_info in private_info.items():
+            row = previous.get(pid)
+            if row is None or p_info.trust_dirty:
+                row = dict(p_info.trust_scores)
+                p_info.trust_dirty = False
+            trust_snapshot[pid] = row
+        state.trust_snapshot = trust_snapshot
     
-    state.public_events.append(Event(day=state.day, phase=state.phase, description=description, actor_id=actor_id, target_id=target_id, recommendation=recommendation, statement=statement, votes=votes, vote_reasons=vote_reasons, trust_scores=trust_snapshot))
+    state.public_events.append(Event(day=state.day, phase=state.phase, description=description, actor_id=actor_id, target_id=target_id, recommendation=recommendation, statement=statement, votes=votes, vote_reasons=vote_reasons, trust_scores=trust_snapshot, death_cause=death_cause))
+    rec_data = None
+    if recommendation:
+        rec_data = {
+            "win_rate": recommendation.win_rate_estimate,
+            "reason": recommendation.reason
+        }
+    state.history.append({
+        "day": state.day,
+        "phase": state.phase.value,
+        "description": description,
+        "actor_id": actor_id,
+        "target_id": target_id,
+        "votes": votes,
+        "death_cause": death_cause,
+        "recommendation": rec_data
+    })
+    state.event_days.append(state.day)
+    state.event_actor_ids.append(actor_id)
+    state.event_claimed_roles.append(statement.claimed_role if statement else None)
+    if statement and statement.claimed_role:
+        state.last_statement_by_role[(statement.actor_id, statement.claimed_role)] = statement
+        if statement.claimed_role == Role.SEER:
+            cleared = state.seer_cleared_masks.get(statement.actor_id, 0)
+            for pid, is_wolf in statement.claimed_checks.items():
+                if not is_wolf:
+                    cleared |= 1 << pid
+            state.seer_cleared_masks[statement.actor_id] = cleared
 
 
 
@@ -154,8 +202,12 @@ def apply_action(state: GameState, action: Action, recommendation: Optional[Reco
         state.phase = Phase.NIGHT_SEER
         return
     if state.phase == Phase.NIGHT_SEER and action.action_type == ActionType.CHECK:
-        target_role = role_of(state, action.target_id)
-        state.private_info[action.actor_id].seer_results[action.target_id] = target_role == Role.WOLF
+        is_wolf = state.roles_by_id[action.target_id] == Role.WOLF
+        private = state.private_info[action.actor_id]
+        private.seer_results[action.target_id] = is_wolf
+        private.seer_checked_mask |= 1 << action.target_id
+        if is_wolf:
+            private.seer_wolves_mask |= 1 << action.target_id
         record_event(state, "预言家查验了目标", actor_id=action.actor_id, target_id=action.target_id, recommendation=recommendation)
         state.phase = Phase.NIGHT_WITCH
         return
@@ -168,7 +220,7 @@ def apply_action(state: GameState, action: Action, recommendation: Optional[Reco
                 state.pending_kill = None
         if action.action_type == ActionType.POISON and action.target_id is not None:
             state.private_info[action.actor_id].witch_state.poison_used = True
-            record_event(state, "女巫使用了毒药", actor_id=action.actor_id, target_id=action.target_id, recommendation=recommendation)
+            record_event(state, "女巫使用了毒药", actor_id=action.actor_id, target_id=action.target_id, recommendation=recommendation, death_cause="WITCH")
             kill_player(state, action.target_id, reason="WITCH")
         if action.action_type == ActionType.PASS:
             record_event(state, "女巫选择了不使用药水", actor_id=action.actor_id, recommendation=recommendation)
@@ -180,7 +232,7 @@ def apply_action(state: GameState, action: Action, recommendation: Optional[Reco
     if state.phase == Phase.DAY_VOTE and action.action_type == ActionType.VOTE:
 
         kill_player(state, action.target_id, reason="VOTE")
-        record_event(state, "放逐了玩家", actor_id=action.actor_id, target_id=action.target_id, recommendation=recommendation)
+        record_event(state, "放逐了玩家", actor_id=action.actor_id, target_id=action.target_id, recommendation=recommendation, death_cause="VOTE")
         resolve_day(state)
         return
 
@@ -188,7 +240,7 @@ def apply_action(state: GameState, action: Action, recommendation: Optional[Reco
 def resolve_night(state: GameState) -> None:
     if state.pending_kill is not None:
         kill_player(state, state.pending_kill, reason="WOLF")
-        record_event(state, "夜晚击杀生效", target_id=state.pending_kill)
+        record_event(state, "夜晚击杀生效", target_id=state.pending_kill, death_cause="WOLF")
         state.pending_kill = None
     winner = check_winner(state)
     if winner is not None:
@@ -214,25 +266,52 @@ def resolve_day(state: GameState) -> None:
 def kill_player(state: GameState, target_id: Optional[int], reason: str = "UNKNOWN") -> None:
     if target_id is None:
         return
+    state.deaths += 1
     # Modify the player object in the list directly
-    for p in state.players:
-        if p.player_id == target_id:
-            p.alive = False
-            p.death_reason = reason
-            break
+    p = state.players_by_id[target_id]
+    if p.alive:
+        state.alive_mask &= ~(1 << target_id)
+        if p.role == Role.WOLF:
+            state.alive_wolves -= 1
+        else:
+            state.alive_villagers -= 1
+            if p.role == Role.HUNTER:
+                state.pending_hunter_shots.append(target_id)
+    p.alive = False
+    p.death_reason = reason
 
 
 def get_unshot_dead_hunters(state: GameState) -> List[Player]:
-    dead_hunters = [p for p in state.players if p.role == Role.HUNTER and not p.alive]
-    return [h for h in dead_hunters if not any(e.description == "猎人开枪" and e.actor_id == h.player_id for e in state.public_events)]
+    players_by_id = state.players_by_id
+    return [players_by_id[pid] for pid in state.players_by_role.get(Role.HUNTER, ())
+            if not players_by_id[pid].alive and pid not in state.shot_hunters]
 
 
 def get_player_view(state: GameState, player_id: int) -> Dict:
-    player = get_player(state, player_id)
+    # Public changes add an event or bump state.deaths. The witch potions are
+    # spent by the strategy before their event is recorded, so they are part
+    # of the key as well. Only the latest view per player is kept.
     private = state.private_info[player_id]
-    return {
+    witch = private.witch_state
+    key = (len(state.public_events), state.deaths, state.day, state.phase, witch.save_used, witch.poison_used)
+    cached = state.view_cache.get(player_id)
+    if cached is not None and cached[0] == key:
+        # Shallow copy: the nested lists and dicts are shared, do not mutate them
+        return dict(cached[1])
+    # Only serialize events added since the last call
+    event_views = state.public_event_views
+    for e in state.public_events[len(event_views):]:
+        event_views.append({
+            "day": e.day,
+            "phase": e.phase.value,
+            "description": e.description,
+            "actor_id": e.actor_id,
+            "target_id": e.target_id,
+        })
+    player = get_player(state, player_id)
+    view = {
         "player_id": player_id,
-        "role": player.role.value,
+        "role": player.role.name,
         "alive": player.alive,
         "day": state.day,
         "phase": state.phase.value,
@@ -241,22 +320,15 @@ def get_player_view(state: GameState, player_id: int) -> Dict:
             "save_used": private.witch_state.save_used,
             "poison_used": private.witch_state.poison_used,
         },
-        "public_events": [
-            {
-                "day": e.day,
-                "phase": e.phase.value,
-                "description": e.description,
-                "actor_id": e.actor_id,
-                "target_id": e.target_id,
-            }
-            for e in state.public_events
-        ],
+        "public_events": list(event_views),
         "alive_players": [p.player_id for p in alive_players(state)],
         "all_players_state": {
             p.player_id: {
                 "alive": p.alive,
-                "role": p.role.value,
+                "role": p.role.name,
                 "death_reason": p.death_reason
             } for p in state.players
         }
     }
+    state.view_cache[player_id] = (key, view)
+    return dict(view)
@@ -1,31 +1,86 @@
 
+import math
+import os
 import random
-import copy
-from typing import Dict, List, Optional, Set
+from collections import Counter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from concurrent.futures import Executor
 from dataclasses import dataclass, field
-from enum import Enum
 
-from .models import GameState, Role, Faction, PlayerPrivate, WitchState, Player
+from .models import GameState, Role, Faction
 
-@dataclass
+# FastState deliberately uses shallow assignment + overwrite; deepcopy is forbidden on the MC hot path.
+
+# Small integer codes used by the flat rollout state. Role is an IntEnum,
+# so the codes are its values stored as bare ints.
+WOLF_CODE, SEER_CODE, WITCH_CODE, HUNTER_CODE, VILLAGER_CODE = (
+    int(Role.WOLF), int(Role.SEER), int(Role.WITCH), int(Role.HUNTER), int(Role.VILLAGER)
+)
+ROLE_CODES: Dict[Role, int] = {role: int(role) for role in Role}
+
+# seer_checked_arr values
+UNCHECKED, CHECKED_GOOD, CHECKED_WOLF = -1, 0, 1
+
+# Rollouts that have not finished after this many days count as a draw.
+MAX_DAYS = 20
+
+# Below this many rollouts, shipping work to another process costs more than it saves.
+PARALLEL_MIN_SIMULATIONS = 32
+
+# Early stopping: after at least MIN_SIMULATIONS rollouts, check every
+# STOP_CHECK_INTERVAL whether the win rate is more than STOP_Z standard
+# errors away from a coin flip.
+MIN_SIMULATIONS = 16
+STOP_CHECK_INTERVAL = 8
+STOP_Z = 3.0
+
+# mask -> _bits(mask). Rollouts keep revisiting the same few alive sets, and a
+# game has at most 2 ** player_count masks, so the table stays small.
+_BITS_CACHE: Dict[int, Tuple[int, ...]] = {}
+
+def _bits(mask: int) -> Tuple[int, ...]:
+    """Player ids set in a bitmask, in ascending order."""
+    ids = _BITS_CACHE.get(mask)
+    if ids is None:
+        bits = []
+        rest = mask
+        while rest:
+            lsb = rest & -rest
+            bits.append(lsb.bit_length() - 1)
+            rest ^= lsb
+        ids = _BITS_CACHE[mask] = tuple(bits)
+    return ids
+
+@dataclass(slots=True)
 class FastState:
-    """Minimal state for fast simulation."""
-    roles: Dict[int, Role]
-    alive: Set[int]
+    """Minimal state for fast simulation: roles per player id, alive players as a bitmask."""
+    roles_arr: List[int]  # Role code per player
+    alive_mask: int  # Bit pid set <=> player pid alive
     witch_save_used: bool
     witch_poison_used: bool
-    seer_checked: Dict[int, bool]  # Target ID -> Is Wolf
+    seer_checked_arr: List[int]  # UNCHECKED / CHECKED_GOOD / CHECKED_WOLF
+    wolf_mask: int = field(init=False)
     # Track who knows what (simplified)
     # Wolves know each other.
     # Good guys know only public info + their own checks.
 
+    def __post_init__(self):
+        self.set_roles(self.roles_arr)
+
+    def set_roles(self, roles_arr: List[int]) -> None:
+        self.roles_arr = roles_arr
+        self.wolf_mask = 0
+        for pid, r in enumerate(roles_arr):
+            if r == WOLF_CODE:
+                self.wolf_mask |= 1 << pid
+
     def is_game_over(self) -> Optional[Faction]:
-        wolves = [pid for pid in self.alive if self.roles[pid] == Role.WOLF]
-        good = [pid for pid in self.alive if self.roles[pid] != Role.WOLF]
+        wolves = (self.alive_mask & self.wolf_mask).bit_count()
+        good = (self.alive_mask & ~self.wolf_mask).bit_count()
         
-        if not wolves:
+        if wolves == 0:
             return Faction.VILLAGE
-        if len(wolves) >= len(good):
+        if wolves >= good:
             return Faction.WOLF
         return None
 
@@ -41,59 +96,84 @@ class FastSimulator:
       - If no confirmed wolf, Good votes randomly among suspects.
       - Wolves vote for Good players.
     """
-    def __init__(self, state: FastState):
+    __slots__ = ("state", "rng", "_role_index", "_seer_id", "_witch_id")
+
+    def __init__(self, state: FastState, rng=random):
         self.state = state
+        self.rng = rng
+        self.index_roles()
+
+    def index_roles(self) -> None:
+        # Roles are fixed for the whole rollout, so index them once.
+        self._role_index: Dict[int, int] = {}
+        for pid, r in enumerate(self.state.roles_arr):
+            self._role_index.setdefault(r, pid)
+        self._seer_id = self._role_index.get(SEER_CODE)
+        self._witch_id = self._role_index.get(WITCH_CODE)
 
     def run(self) -> Faction:
+        # Bound once: the loop below runs for every rollout of every estimate.
+        is_game_over = self.state.is_game_over
+        night_phase = self._night_phase
+        day_phase = self._day_phase
+        
         # Prevent infinite loops with a max round counter
-        for _ in range(20): # 20 days max
-            winner = self.state.is_game_over()
+        for _ in range(MAX_DAYS):
+            winner = is_game_over()
             if winner: return winner
 
-            self._night_phase()
+            night_phase()
             
-            winner = self.state.is_game_over()
+            winner = is_game_over()
             if winner: return winner
             
-            self._day_phase()
+            day_phase()
         
         return Faction.VILLAGE # Draw favors Village? Or random? Let's say Village for now.
 
+    def _on_death(self, pid: int) -> None:
+        self.state.alive_mask &= ~(1 << pid)
+
+    def _alive(self) -> Tuple[int, ...]:
+        return _bits(self.state.alive_mask)
+
+    def _good_alive(self) -> Tuple[int, ...]:
+        return _bits(self.state.alive_mask & ~self.state.wolf_mask)
+
+    def _is_alive(self, pid: Optional[int]) -> bool:
+        return pid is not None and (self.state.alive_mask >> pid) & 1 == 1
+
     def _night_phase(self):
         # 1. Wolf Kill
         target = self._wolf_choose_target()
         
         # 2. Witch Save
-        saved = False
-        witch_id = self._find_role(Role.WITCH)
-        if witch_id in self.state.alive and not self.state.witch_save_used:
-            # Simple heuristic: Save the first person killed (50% chance?)
-            # Or always save if self is not target?
-            # Let's say Witch saves 80% of the time on Night 1/2.
-            if random.random() < 0.8:
-                saved = True
-                self.state.witch_save_used = True
+        # Each potion is a single short-circuit chain: the rng is only drawn
+        # when the witch is alive and still holds that potion.
+        state = self.state
+        rng = self.rng
+        witch_id = self._witch_id
+        witch_alive = self._is_alive(witch_id)
+        # Let's say Witch saves 80% of the time on Night 1/2.
+        saved = witch_alive and not state.witch_save_used and rng.random() < 0.8
+        state.witch_save_used |= saved
         
         # 3. Witch Poison
-        poison_target = None
-        if witch_id in self.state.alive and not self.state.witch_poison_used:
-            # Poison if Seer found a wolf and communicated it?
-            # In simulation, we simplify: Random poison late game (30%)
-            if random.random() < 0.3:
-                # Poison a random non-confirmed good
-                candidates = self._get_suspects(witch_id)
-                if candidates:
-                    poison_target = random.choice(candidates)
-                    self.state.witch_poison_used = True
+        # In simulation, we simplify: Random poison late game (30%),
+        # on a random non-confirmed good.
+        poisons = witch_alive and not state.witch_poison_used and rng.random() < 0.3
+        candidates = self._get_suspects(witch_id) if poisons else None
+        poison_target = rng.choice(candidates) if candidates else None
+        state.witch_poison_used |= poison_target is not None
 
         # 4. Seer Check
-        seer_id = self._find_role(Role.SEER)
-        if seer_id in self.state.alive:
-            unknowns = [p for p in self.state.alive if p != seer_id and p not in self.state.seer_checked]
+        seer_id = self._seer_id
+        if self._is_alive(seer_id):
+            checked = self.state.seer_checked_arr
+            unknowns = [p for p in _bits(self.state.alive_mask & ~(1 << seer_id)) if checked[p] == UNCHECKED]
             if unknowns:
-                check = random.choice(unknowns)
-                is_wolf = (self.state.roles[check] == Role.WOLF)
-                self.state.seer_checked[check] = is_wolf
+                check = self.rng.choice(unknowns)
+                checked[check] = CHECKED_WOLF if self.state.roles_arr[check] == WOLF_CODE else CHECKED_GOOD
 
         # Resolve Deaths
         deaths = []
@@ -103,68 +183,73 @@ class FastSimulator:
             deaths.append(poison_target)
         
         for d in deaths:
-            self.state.alive.discard(d)
+            self._on_death(d)
 
     def _day_phase(self):
         # Voting Logic
         # 1. Check if Seer is alive and has found a wolf
-        seer_id = self._find_role(Role.SEER)
+        seer_id = self._seer_id
         known_wolf = None
+        roles_arr = self.state.roles_arr
+        alive_mask = self.state.alive_mask
+        choice = self.rng.choice
         
-        if seer_id in self.state.alive:
+        if self._is_alive(seer_id):
             # Find a checked wolf
-            for pid, is_wolf in self.state.seer_checked.items():
-                if is_wolf and pid in self.state.alive:
+            for pid, result in enumerate(self.state.seer_checked_arr):
+                if result == CHECKED_WOLF and (alive_mask >> pid) & 1:
                     known_wolf = pid
                     break
         
         # Vote Targets
-        votes = {} # target -> count
+        vote_arr = [0] * len(roles_arr) # target -> count
         
-        wolves = [p for p in self.state.alive if self.state.roles[p] == Role.WOLF]
-        good = [p for p in self.state.alive if self.state.roles[p] != Role.WOLF]
+        alive = _bits(alive_mask)
+        num_wolves = (alive_mask & self.state.wolf_mask).bit_count()
+        good = self._good_alive()
         
         # Wolf Strategy: Vote for a random Good player
         # (Unless bus strategy, but let's stick to simple team play)
-        wolf_target = random.choice(good) if good else None
+        wolf_target = choice(good) if good else None
         
-        for w in wolves:
-            if wolf_target:
-                votes[wolf_target] = votes.get(wolf_target, 0) + 1
+        if wolf_target is not None:
+            vote_arr[wolf_target] += num_wolves
                 
         # Good Strategy
-        for g in good:
-            if known_wolf:
-                # If Seer exposed a wolf, vote for it!
-                votes[known_wolf] = votes.get(known_wolf, 0) + 1
-            else:
-                # Vote for a random suspect (someone not known to be good)
-                # In simulation, good players don't know roles.
-                # Simplification: They vote for a random person who is NOT themselves.
-                # (Ideally exclude confirmed good, but we don't track confirmed good fully here)
-                candidates = [p for p in self.state.alive if p != g]
-                if candidates:
-                    vote = random.choice(candidates)
-                    votes[vote] = votes.get(vote, 0) + 1
+        if known_wolf is not None:
+            # If Seer exposed a wolf, everyone votes for it!
+            vote_arr[known_wolf] += len(good)
+        elif len(alive) > 1:
+            # Vote for a random suspect (someone not known to be good)
+            # In simulation, good players don't know roles.
+            # Simplification: They vote for a random person who is NOT themselves.
+            # (Ideally exclude confirmed good, but we don't track confirmed good fully here)
+            for g in good:
+                vote = choice(alive)
+                while vote == g: # Redraw only if we picked ourselves
+                    vote = choice(alive)
+                vote_arr[vote] += 1
         
         # Tally
-        if not votes: return
-        
-        # Sort by votes
-        sorted_votes = sorted(votes.items(), key=lambda x: x[1], reverse=True)
-        top_target, top_count = sorted_votes[0]
+        top_count = max(vote_arr)
+        if top_count == 0: return
+        # The wolf bloc's target was voted for first, so it wins ties
+        if wolf_target is not None and vote_arr[wolf_target] == top_count:
+            top_target = wolf_target
+        else:
+            top_target = vote_arr.index(top_count)
         
         # Handle Tie (Simple: random among ties, or no death)
         # Let's say max vote dies.
-        self.state.alive.discard(top_target)
+        self._on_death(top_target)
         
         # Hunter Death Logic (Simplified)
-        if self.state.roles.get(top_target) == Role.HUNTER:
+        if roles_arr[top_target] == HUNTER_CODE:
              # Shoot a random person
-             candidates = [p for p in self.state.alive]
+             candidates = self._alive()
              if candidates:
-                 shot = random.choice(candidates)
-                 self.state.alive.discard(shot)
+                 shot = choice(candidates)
+                 self._on_death(shot)
 
     def _wolf_choose_target(self) -> Optional[int]:
         # Priority: Seer > Witch > Villager
@@ -173,49 +258,105 @@ class FastSimulator:
         # In this world, roles are assigned.
         # REAL Wolves know roles. So in simulation, Wolf Bots should know roles.
         
-        alive = self.state.alive
-        good_alive = [p for p in alive if self.state.roles[p] != Role.WOLF]
-        if not good_alive: return None
+        if not self.state.alive_mask & ~self.state.wolf_mask: return None
         
         # Try to find Gods
-        seer = self._find_role(Role.SEER)
-        witch = self._find_role(Role.WITCH)
+        seer = self._seer_id
+        witch = self._witch_id
         
-        if seer in alive: return seer
-        if witch in alive: return witch
+        if self._is_alive(seer): return seer
+        if self._is_alive(witch): return witch
         
-        return random.choice(good_alive)
-
-    def _find_role(self, role: Role) -> Optional[int]:
-        for pid, r in self.state.roles.items():
-            if r == role: return pid
-        return None
+        return self.rng.choice(self._good_alive())
 
-    def _get_suspects(self, actor_id: int) -> List[int]:
+    def _get_suspects(self, actor_id: int) -> Tuple[int, ...]:
         # Anyone alive except self
-        return [p for p in self.state.alive if p != actor_id]
+        return _bits(self.state.alive_mask & ~(1 << actor_id))
+
+
+class BatchFastSimulator:
+    """
+    Runs many FastSimulator rollouts that share one public starting point.
+    Alive players, witch potions and the Seer's memory are captured once;
+    each sampled world only contributes its role assignment.
+    A single FastState / FastSimulator pair is reset and reused per world.
+    """
+    def __init__(self, num_players: int, alive: Set[int], witch_save_used: bool, witch_poison_used: bool, seer_checked: Dict[int, bool], rng=random):
+        self.num_players = num_players
+        self.rng = rng
+        self.alive_mask = 0
+        for pid in alive:
+            self.alive_mask |= 1 << pid
+        self.witch_save_used = witch_save_used
+        self.witch_poison_used = witch_poison_used
+        self.seer_checked_arr = [UNCHECKED] * num_players
+        for pid, is_wolf in seer_checked.items():
+            self.seer_checked_arr[pid] = CHECKED_WOLF if is_wolf else CHECKED_GOOD
+        self._state = FastState(
+            roles_arr=[VILLAGER_CODE] * num_players,
+            alive_mask=self.alive_mask,
+            witch_save_used=witch_save_used,
+            witch_poison_used=witch_poison_used,
+            seer_checked_arr=list(self.seer_checked_arr)
+        )
+        self._sim = FastSimulator(self._state, rng)
+
+    def run(self, roles_arr: List[int]) -> Faction:
+        sim_state = self._state
+        sim_state.set_roles(roles_arr)
+        sim_state.alive_mask = self.alive_mask
+        sim_state.witch_save_used = self.witch_save_used
+        sim_state.witch_poison_used = self.witch_poison_used
+        sim_state.seer_checked_arr[:] = self.seer_checked_arr
+        self._sim.index_roles()
+        return self._sim.run()
+
+    def count_wins(self, worlds: Iterable[List[int]], faction: Faction) -> int:
+        run = self.run
+        return sum(1 for roles in worlds if run(roles) == faction)
 
 
 class WinRateEstimator:
-    def __init__(self, num_simulations: int = 50):
+    def __init__(self, num_simulations: int = 50, rng=random, executor: Optional[Executor] = None, min_simulations: int = MIN_SIMULATIONS):
+        # num_simulations is the cap; sequential estimates may stop after
+        # min_simulations once the outcome is clear.
         self.num_simulations = num_simulations
+        self.min_simulations = min_simulations
+        # One random stream feeds world sampling and every rollout.
+        # SimpleStrategy hands in its own seeded stream; standalone use
+        # falls back to the module-level generator.
+        self.rng = rng
+        # Optional process pool for offline batch evaluation. The browser
+        # build has no worker processes, so rollouts run inline by default.
+        self.executor = executor
+
+    @staticmethod
+    def position_key(state: GameState, actor_id: int) -> Tuple:
+        """
+        Everything estimate() reads from state for actor_id, as a hashable key.
+        Two states with equal keys give the same estimate distribution.
+        """
+        private = state.private_info.get(actor_id)
+        seer_results = tuple(private.seer_results.items()) if private else ()
+        witch = (private.witch_state.save_used, private.witch_state.poison_used) if private else ()
+        return (
+            actor_id,
+            tuple((p.player_id, p.role, p.alive) for p in state.players),
+            seer_results,
+            witch,
+        )
 
     def estimate(self, state: GameState, actor_id: int) -> float:
         """
         Estimate win rate for the faction of actor_id using Monte Carlo simulation.
         """
-        my_role = state.players[actor_id].role if actor_id < len(state.players) else Role.VILLAGER
-        # Use Engine's role_of logic if available, but here we access direct
-        # Actually state.players is a list of Player objects.
         # Find player object
-        my_player = next((p for p in state.players if p.player_id == actor_id), None)
+        my_player = state.players_by_id.get(actor_id)
         if not my_player: return 0.5
         
         my_role = my_player.role
         my_faction = Faction.WOLF if my_role == Role.WOLF else Faction.VILLAGE
         
-        wins = 0
-        
         # 1. Identify Fixed Information (Constraints)
         fixed_roles = {}
         fixed_roles[actor_id] = my_role
@@ -253,22 +394,13 @@ class WinRateEstimator:
 
         # 2. Prepare Pool for Unknowns
         # Total roles in the game
-        all_roles_list = []
-        for p in state.players:
-            all_roles_list.append(p.role)
+        pool_counts = Counter(p.role for p in state.players)
             
         # Remove fixed roles from the pool
-        pool = list(all_roles_list)
         for pid, role in fixed_roles.items():
-            if role in pool:
-                pool.remove(role)
-            elif role == Role.VILLAGER and Role.VILLAGER not in pool:
-                 # Seer saw a "Good" (Villager/God). We assigned Villager in fixed_roles as placeholder?
-                 # Wait, Seer check result is boolean.
-                 # If I am Seer and checked X is Good. X could be Witch, Hunter, Villager.
-                 # This makes sampling harder.
-                 # Simplification: If Seer sees Good, we treat it as "Constraint: X is not Wolf".
-                 pass
+            if pool_counts[role] > 0:
+                pool_counts[role] -= 1
+        pool = list(pool_counts.elements())
         
         # Refined Sampling:
         # We need to assign roles to unknown players such that constraints are met.
@@ -290,104 +422,120 @@ class WinRateEstimator:
         # Filter pool to ensure we can satisfy known_goods
         # The pool must contain enough non-wolf roles for known_good_ids that are in unknown_players
         
-        # 3. Run Simulations
-        for _ in range(self.num_simulations):
-            # Sample a world
-            current_pool = list(pool)
-            random.shuffle(current_pool)
-            
-            # Assign roles
-            temp_roles = dict(fixed_roles)
-            
-            # Check if assignment is valid regarding Known Goods
-            # We need to assign Non-Wolf to Known Goods
-            
-            # Split unknown players into "Must be Good" and "Any"
-            must_be_good = [uid for uid in unknown_players if uid in known_good_ids]
-            others = [uid for uid in unknown_players if uid not in known_good_ids]
-            
-            # Try to assign
-            # This is a bit complex if pool doesn't have enough goods (logic error elsewhere).
-            # Simple approach: Re-shuffle until valid (Rejection Sampling).
-            
-            valid_assignment = False
-            attempt_limit = 10
-            
-            assigned_map = {}
-            
-            for attempt in range(attempt_limit):
-                random.shuffle(current_pool)
-                # Try to pop goods for must_be_good
-                temp_pool = list(current_pool)
-                current_assignment = {}
-                
-                possible = True
-                for mg in must_be_good:
-                    # Find a non-wolf in temp_pool
-                    # Prefer Villager/God
-                    found = False
-                    for i, r in enumerate(temp_pool):
-                        if r != Role.WOLF:
-                            current_assignment[mg] = temp_pool.pop(i)
-                            found = True
-                            break
-                    if not found:
-                        possible = False
-                        break
-                
-                if possible:
-                    # Assign rest
-                    for o in others:
-                        current_assignment[o] = temp_pool.pop(0)
-                    assigned_map = current_assignment
-                    valid_assignment = True
-                    break
-            
-            if not valid_assignment:
-                # Fallback: Just random assign (ignore Seer info to avoid crash)
-                # This dilutes accuracy but keeps robustness
-                random.shuffle(current_pool)
-                for i, uid in enumerate(unknown_players):
-                    assigned_map[uid] = current_pool[i]
-
-            temp_roles.update(assigned_map)
-            
-            # Build FastState
-            # Witch State?
-            # If I am Witch, I know my state.
-            # If I am not, I assume Witch state is default (fresh) unless public info says otherwise.
-            # (Simplification: Assume fresh)
-            
-            w_save = False
-            w_poison = False
-            
-            # Check if Witch is already dead?
-            # If Witch is dead, effectively powers are gone.
-            # FastSimulator handles alive check.
-            
-            # If I am Witch, use my actual state
-            if my_role == Role.WITCH and actor_id in state.private_info:
-                w_state = state.private_info[actor_id].witch_state
-                w_save = w_state.save_used
-                w_poison = w_state.poison_used
-
-            sim_state = FastState(
-                roles=temp_roles,
-                alive={p.player_id for p in state.players if p.alive},
-                witch_save_used=w_save,
-                witch_poison_used=w_poison,
-                seer_checked={} # Reset check memory for simulation Seer
-            )
-            
-            # If I am Seer, the simulation Seer should know what I know?
-            # Yes, pre-fill seer_checked
-            if my_role == Role.SEER and actor_id in state.private_info:
-                sim_state.seer_checked = dict(state.private_info[actor_id].seer_results)
+        # 3. Shared starting point for every rollout
+        # If I am Witch, I know my state.
+        # If I am not, I assume Witch state is default (fresh) unless public info says otherwise.
+        # (Simplification: Assume fresh)
+        w_save = False
+        w_poison = False
+        
+        # If I am Witch, use my actual state
+        if my_role == Role.WITCH and actor_id in state.private_info:
+            w_state = state.private_info[actor_id].witch_state
+            w_save = w_state.save_used
+            w_poison = w_state.poison_used
 
-            simulator = FastSimulator(sim_state)
-            winner = simulator.run()
-            
-            if winner == my_faction:
+        # If I am Seer, the simulation Seer should know what I know
+        seer_checked = {}
+        if my_role == Role.SEER and actor_id in state.private_info:
+            seer_checked = state.private_info[actor_id].seer_results
+
+        num_players = max(p.player_id for p in state.players) + 1
+        alive = {p.player_id for p in state.players if p.alive}
+        batch_args = (num_players, alive, w_save, w_poison, seer_checked)
+        sample_args = (num_players, pool, fixed_roles, unknown_players, known_good_ids)
+
+        # 4. Run Simulations
+        if self.executor is not None and self.num_simulations >= PARALLEL_MIN_SIMULATIONS:
+            wins = self._count_wins_parallel(batch_args, sample_args, my_faction)
+            return wins / self.num_simulations
+
+        batch = BatchFastSimulator(*batch_args, rng=self.rng)
+        worlds = _sample_worlds(*sample_args, self.num_simulations, self.rng)
+        wins, runs = self._count_wins_until_decided(batch, worlds, my_faction)
+        return wins / runs
+
+    def _count_wins_until_decided(self, batch: "BatchFastSimulator", worlds: Iterable[List[int]], faction: Faction) -> Tuple[int, int]:
+        # Returns (wins, rollouts run). Stops early once the win rate is
+        # clearly away from 0.5, so lopsided positions cost fewer rollouts.
+        run = batch.run
+        min_runs = self.min_simulations
+        wins = runs = 0
+        for roles in worlds:
+            if run(roles) == faction:
                 wins += 1
-                
-        return wins / self.num_simulations
+            runs += 1
+            if runs >= min_runs and runs % STOP_CHECK_INTERVAL == 0:
+                mean = wins / runs
+                se = math.sqrt(mean * (1 - mean) / runs)
+                if abs(mean - 0.5) > STOP_Z * se:
+                    break
+        return wins, runs
+
+    def _count_wins_parallel(self, batch_args: Tuple, sample_args: Tuple, faction: Faction) -> int:
+        # Rollouts are independent: split them into one chunk per core,
+        # each with its own seed drawn from our stream.
+        chunks = min(os.cpu_count() or 1, self.num_simulations)
+        base, extra = divmod(self.num_simulations, chunks)
+        base_seed = self.rng.getrandbits(32)
+        futures = [
+            self.executor.submit(_simulate_chunk, batch_args, sample_args, faction, base + (i < extra), base_seed + i)
+            for i in range(chunks)
+        ]
+        return sum(f.result() for f in futures)
+
+
+def _sample_worlds(num_players: int, pool: List[Role], fixed_roles: Dict[int, Role], unknown_players: List[int], known_good_ids: Set[int], num_worlds: int, rng) -> Iterator[List[int]]:
+    """
+    Yield num_worlds role-code lists consistent with what the actor knows.
+    The same list is refilled for every world, so consume it before advancing.
+    """
+    # Split unknown players into "Must be Good" and "Any"
+    must_be_good = [uid for uid in unknown_players if uid in known_good_ids]
+    others = [uid for uid in unknown_players if uid not in known_good_ids]
+    
+    # Fixed roles never move; every unknown slot is overwritten for each world
+    # (the pool always holds at least one role per unknown player).
+    roles_arr = [VILLAGER_CODE] * num_players
+    for pid, role in fixed_roles.items():
+        roles_arr[pid] = ROLE_CODES[role]
+    
+    # Constructive sampling: deal goods to "Must be Good" first, then
+    # shuffle whatever is left over the remaining players.
+    pool_codes = [ROLE_CODES[r] for r in pool]
+    goods_in_pool = [c for c in pool_codes if c != WOLF_CODE]
+    wolves_in_pool = [WOLF_CODE] * (len(pool_codes) - len(goods_in_pool))
+    num_must_be_good = len(must_be_good)
+    feasible = num_must_be_good <= len(goods_in_pool)
+    shuffle = rng.shuffle
+    
+    for _ in range(num_worlds):
+        # Sample a world
+        if not feasible:
+            # Fallback: Just random assign (ignore Seer info to avoid crash)
+            # This dilutes accuracy but keeps robustness
+            shuffle(pool_codes)
+            for uid, code in zip(unknown_players, pool_codes):
+                roles_arr[uid] = code
+        elif must_be_good:
+            shuffle(goods_in_pool)
+            for uid, code in zip(must_be_good, goods_in_pool):
+                roles_arr[uid] = code
+            rest = goods_in_pool[num_must_be_good:] + wolves_in_pool
+            shuffle(rest)
+            for uid, code in zip(others, rest):
+                roles_arr[uid] = code
+        else:
+            # Common case: no constraint, shuffle the pool buffer in place
+            shuffle(pool_codes)
+            for uid, code in zip(others, pool_codes):
+                roles_arr[uid] = code
+
+        yield roles_arr
+
+
+def _simulate_chunk(batch_args: Tuple, sample_args: Tuple, faction: Faction, num_worlds: int, seed: int) -> int:
+    """Run num_worlds rollouts with a private RNG. Module-level so process pools can pickle it."""
+    rng = random.Random(seed)
+    batch = BatchFastSimulator(*batch_args, rng=rng)
+    return batch.count_wins(_sample_worlds(*sample_args, num_worlds, rng), faction)
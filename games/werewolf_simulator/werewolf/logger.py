@@ -1,3 +1,4 @@
+from collections import defaultdict
 from typing import List, Dict
 import os
 from datetime import datetime
@@ -14,8 +15,7 @@ class GameLogger:
         
         # Sort players by ID
         sorted_players = sorted(state.players, key=lambda p: p.player_id)
-        for p in sorted_players:
-            lines.append(f"Player {p.player_id}: {p.role.value}")
+        lines.extend([f"Player {p.player_id}: {p.role.name}" for p in sorted_players])
             
         lines.append("\n" + "=" * 50)
         lines.append("[Game Events]")
@@ -47,22 +47,21 @@ class GameLogger:
             if votes:
                 lines.append("  Votes:")
                 # Invert votes: Target -> [Voters]
-                vote_map = {}
+                vote_map = defaultdict(list)
                 for voter, tgt in votes.items():
-                    if tgt not in vote_map: vote_map[tgt] = []
-                    vote_map[tgt].append(voter)
+                    vote_map[tgt].append(str(voter))
                 
-                for tgt, voters in vote_map.items():
-                    voter_list = ", ".join(voters)
-                    lines.append(f"    Target Player {tgt} received {len(voters)} votes from: {voter_list}")
+                lines.extend([
+                    f"    Target Player {tgt} received {len(voters)} votes from: {', '.join(voters)}"
+                    for tgt, voters in vote_map.items()
+                ])
                     
             if reasons:
                 lines.append("  Vote Reasons:")
-                for voter, reason in reasons.items():
-                    lines.append(f"    Player {voter}: {reason}")
+                lines.extend([f"    Player {voter}: {reason}" for voter, reason in reasons.items()])
                     
         lines.append("\n" + "=" * 50)
-        lines.append(f"Game Over. Winner: {state.winner.value if state.winner else 'None'}")
+        lines.append(f"Game Over. Winner: {state.winner.name if state.winner else 'None'}")
         lines.append("=" * 50)
         
         return "\n".join(lines)
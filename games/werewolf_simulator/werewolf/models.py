@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+from collections import deque
 from dataclasses import dataclass, field
-from enum import Enum
-from typing import Dict, List, Optional, Any
+from enum import Enum, IntEnum
+from typing import Deque, Dict, List, Optional, Any, Set, Tuple
 
 
-class Role(str, Enum):
-    WOLF = "WOLF"
-    SEER = "SEER"
-    WITCH = "WITCH"
-    HUNTER = "HUNTER"
-    VILLAGER = "VILLAGER"
+# Roles and factions are compared in every hot loop, so they are plain ints.
+# Use .name wherever the string form is needed (logs, UI, JSON).
+# Values start at 1 so every member stays truthy ("if winner:" etc.).
+class Role(IntEnum):
+    WOLF = 1
+    SEER = 2
+    WITCH = 3
+    HUNTER = 4
+    VILLAGER = 5
 
 
-class Faction(str, Enum):
-    WOLF = "WOLF"
-    VILLAGE = "VILLAGE"
+class Faction(IntEnum):
+    WOLF = 1
+    VILLAGE = 2
 
 
 class Phase(str, Enum):
@@ -38,7 +42,7 @@ class ActionType(str, Enum):
     SPEAK = "SPEAK"
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     player_id: int
     role: Role
@@ -46,24 +50,45 @@ class Player:
     death_reason: Optional[str] = None # "VOTE", "WOLF", "WITCH", "HUNTER"
 
 
-@dataclass
+@dataclass(slots=True)
 class WitchState:
     save_used: bool = False
     poison_used: bool = False
     saved_player_id: Optional[int] = None # Remember who I saved
 
 
-@dataclass
+@dataclass(slots=True)
 class PlayerPrivate:
     seer_results: Dict[int, bool] = field(default_factory=dict)
+    # Bitsets mirroring seer_results (bit pid set): checked at all / checked as Wolf
+    seer_checked_mask: int = 0
+    seer_wolves_mask: int = 0
     witch_state: WitchState = field(default_factory=WitchState)
+    # Write through set_trust/add_trust so trust_dirty stays accurate
     trust_scores: Dict[int, float] = field(default_factory=dict)
+    trust_dirty: bool = False  # trust_scores changed since record_event last snapshot it
     known_seers: List[int] = field(default_factory=list)
+    known_seers_mask: int = 0  # Bitset of known_seers, for membership tests
     known_witches: List[int] = field(default_factory=list)
+    known_witches_mask: int = 0  # Bitset of known_witches
     believed_silver_water: Optional[int] = None # The player I believe is Silver Water (based on Witch claim)
 
+    def get_trust(self, pid: int) -> float:
+        return self.trust_scores.get(pid, 0.5)
 
-@dataclass
+    def set_trust(self, pid: int, value: float) -> None:
+        # Clamped to [0, 1]
+        self.trust_scores[pid] = 0.0 if value < 0.0 else 1.0 if value > 1.0 else value
+        self.trust_dirty = True
+
+    def add_trust(self, pid: int, delta: float) -> None:
+        # set_trust(pid, get_trust(pid) + delta) in one lookup
+        value = self.trust_scores.get(pid, 0.5) + delta
+        self.trust_scores[pid] = 0.0 if value < 0.0 else 1.0 if value > 1.0 else value
+        self.trust_dirty = True
+
+
+@dataclass(slots=True)
 class Statement:
     actor_id: int
     content: str
@@ -71,7 +96,7 @@ class Statement:
     claimed_checks: Dict[int, bool] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     action: Action
     reason: str
@@ -79,7 +104,7 @@ class Recommendation:
     alternatives: List[Dict[str, Any]] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     day: int
     phase: Phase
@@ -88,12 +113,13 @@ class Event:
     target_id: Optional[int] = None
     recommendation: Optional[Recommendation] = None
     statement: Optional[Statement] = None
-    votes: Optional[Dict[str, int]] = None  # Mapping: voter_id -> target_id
-    vote_reasons: Optional[Dict[str, str]] = None # Mapping: voter_id -> reason
+    votes: Optional[Dict[int, int]] = None  # Mapping: voter_id -> target_id
+    vote_reasons: Optional[Dict[int, str]] = None # Mapping: voter_id -> reason
     trust_scores: Optional[Dict[int, Dict[int, float]]] = None # Snapshot of trust scores: {observer_id: {target_id: score}}
+    death_cause: Optional[str] = None # Set on events that kill target_id: "VOTE", "WOLF", "WITCH", "HUNTER"
 
 
-@dataclass
+@dataclass(slots=True)
 class Action:
     action_type: ActionType
     actor_id: int
@@ -101,20 +127,148 @@ class Action:
     statement: Optional[Statement] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GameConfig:
     player_count: int
     roles: Dict[Role, int]
     victory_condition: str = "side_slaughter" # "side_slaughter" or "city_slaughter"
 
-@dataclass
+@dataclass(slots=True)
 class GameState:
     players: List[Player]
     day: int
     phase: Phase
     config: GameConfig
     pending_kill: Optional[int] = None
+    deaths: int = 0  # Bumped by kill_player; lets caches notice deaths without a scan
+    # alive_players() result, valid while alive_snapshot_deaths == deaths
+    alive_snapshot: List[Player] = field(default_factory=list, repr=False)
+    alive_snapshot_deaths: int = field(default=-1, repr=False)
     public_events: List[Event] = field(default_factory=list)
+    # public_events in the plain-dict form the web UI replays, appended by record_event
+    history: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    # Columns parallel to public_events (one entry per event), kept by record_event
+    event_days: List[int] = field(default_factory=list)
+    event_actor_ids: List[Optional[int]] = field(default_factory=list)
+    event_claimed_roles: List[Optional[Role]] = field(default_factory=list)
+    # (actor_id, claimed_role) -> that actor's latest statement claiming the role
+    last_statement_by_role: Dict[Tuple[int, Role], Statement] = field(default_factory=dict)
+    # Seer claimer -> bitset of every pid they have reported as good, across all claims
+    seer_cleared_masks: Dict[int, int] = field(default_factory=dict)
+    shot_hunters: Set[int] = field(default_factory=set)  # Hunters whose "猎人开枪" event is recorded
+    pending_hunter_shots: Deque[int] = field(default_factory=deque)  # Dead hunters yet to shoot, queued by kill_player
+    # Trust map of the latest event; record_event shares unchanged rows with it
+    trust_snapshot: Dict[int, Dict[int, float]] = field(default_factory=dict, repr=False)
     private_info: Dict[int, PlayerPrivate] = field(default_factory=dict)
     winner: Optional[Faction] = None
+    # get_player_view memo: public_events already serialized, and each player's
+    # latest view with the key it was built for. Read-only.
+    public_event_views: List[Dict[str, Any]] = field(default_factory=list, repr=False)
+    view_cache: Dict[int, Tuple[Tuple[int, int, int, Phase, bool, bool], Dict[str, Any]]] = field(default_factory=dict, repr=False)
+    players_by_id: Dict[int, Player] = field(init=False, repr=False)
+    roles_by_id: Dict[int, Role] = field(init=False, repr=False)
+    players_by_role: Dict[Role, List[int]] = field(init=False, repr=False)  # Player ids in seat order, dead included
+    # Alive head counts by side, kept by kill_player for check_winner
+    alive_wolves: int = field(init=False)
+    alive_villagers: int = field(init=False)
+    alive_mask: int = field(init=False)  # Bit pid set <=> player pid alive, kept by kill_player
+
+    def __post_init__(self):
+        # The roster is fixed once the game is created
+        self.players_by_id = {p.player_id: p for p in self.players}
+        self.roles_by_id = {p.player_id: p.role for p in self.players}
+        self.players_by_role = {}
+        for p in self.players:
+            self.players_by_role.setdefault(p.role, []).append(p.player_id)
+        self.alive_wolves = sum(1 for p in self.players if p.alive and p.role == Role.WOLF)
+        self.alive_villagers = sum(1 for p in self.players if p.alive and p.role != Role.WOLF)
+        self.alive_mask = 0
+        for p in self.players:
+            if p.alive:
+                self.alive_mask |= 1 << p.player_id
+
+
+    def snapshot(self) -> Tuple:
+        # Flat tuple of the mutable game position, for cheap copies in rollouts.
+        # Recorded events, history dicts, statements and trust_snapshot rows are
+        # never mutated after record_event, so they are shared, not copied.
+        return (
+            self.day,
+            self.phase,
+            self.config,
+            self.pending_kill,
+            self.deaths,
+            self.winner,
+            tuple((p.player_id, p.role, p.alive, p.death_reason) for p in self.players),
+            tuple(
+                (
+                    pid,
+                    tuple(priv.seer_results.items()),
+                    priv.seer_checked_mask,
+                    priv.seer_wolves_mask,
+                    (priv.witch_state.save_used, priv.witch_state.poison_used, priv.witch_state.saved_player_id),
+                    tuple(priv.trust_scores.items()),
+                    priv.trust_dirty,
+                    tuple(priv.known_seers),
+                    priv.known_seers_mask,
+                    tuple(priv.known_witches),
+                    priv.known_witches_mask,
+                    priv.believed_silver_water,
+                )
+                for pid, priv in self.private_info.items()
+            ),
+            tuple(self.public_events),
+            tuple(self.history),
+            tuple(self.event_days),
+            tuple(self.event_actor_ids),
+            tuple(self.event_claimed_roles),
+            tuple(self.last_statement_by_role.items()),
+            tuple(self.seer_cleared_masks.items()),
+            tuple(self.shot_hunters),
+            tuple(self.pending_hunter_shots),
+            self.trust_snapshot,
+        )
 
+    @classmethod
+    def from_snapshot(cls, snap: Tuple) -> GameState:
+        (day, phase, config, pending_kill, deaths, winner, players, privates,
+         public_events, history, event_days, event_actor_ids, event_claimed_roles,
+         last_statement_by_role, seer_cleared_masks, shot_hunters, pending_hunter_shots,
+         trust_snapshot) = snap
+        private_info = {}
+        for (pid, seer_results, seer_checked_mask, seer_wolves_mask, witch, trust_scores, trust_dirty,
+             known_seers, known_seers_mask, known_witches, known_witches_mask, believed_silver_water) in privates:
+            private_info[pid] = PlayerPrivate(
+                seer_results=dict(seer_results),
+                seer_checked_mask=seer_checked_mask,
+                seer_wolves_mask=seer_wolves_mask,
+                witch_state=WitchState(*witch),
+                trust_scores=dict(trust_scores),
+                trust_dirty=trust_dirty,
+                known_seers=list(known_seers),
+                known_seers_mask=known_seers_mask,
+                known_witches=list(known_witches),
+                known_witches_mask=known_witches_mask,
+                believed_silver_water=believed_silver_water,
+            )
+        # __post_init__ rebuilds the roster indexes and alive counters
+        return cls(
+            players=[Player(*p) for p in players],
+            day=day,
+            phase=phase,
+            config=config,
+            pending_kill=pending_kill,
+            deaths=deaths,
+            public_events=list(public_events),
+            history=list(history),
+            event_days=list(event_days),
+            event_actor_ids=list(event_actor_ids),
+            event_claimed_roles=list(event_claimed_roles),
+            last_statement_by_role=dict(last_statement_by_role),
+            seer_cleared_masks=dict(seer_cleared_masks),
+            shot_hunters=set(shot_hunters),
+            pending_hunter_shots=deque(pending_hunter_shots),
+            trust_snapshot=trust_snapshot,
+            private_info=private_info,
+            winner=winner,
+        )
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import os
+from collections import Counter
 from dataclasses import dataclass, field
+from itertools import repeat
 from typing import Dict, List, Optional
 
 from .engine import (
@@ -8,9 +11,7 @@ from .engine import (
     apply_action,
     check_winner,
     create_default_game,
-    get_player,
     get_player_view,
-    get_unshot_dead_hunters,
     record_event,
     alive_players,
     kill_player
@@ -18,8 +19,11 @@ from .engine import (
 from .models import Action, ActionType, Faction, GameState, Phase, Role
 from .strategy import SimpleStrategy
 
+# Phase members are singletons; the run loop compares them by identity.
+_GAME_OVER = Phase.GAME_OVER
 
-@dataclass
+
+@dataclass(slots=True)
 class GameSimulator:
     engine: GameEngine
     history: List[Dict] = field(default_factory=list)
@@ -33,150 +37,128 @@ class GameSimulator:
         # Initial state record
         self.record_history(state)
 
-        while state.phase != Phase.GAME_OVER:
+        while state.phase is not _GAME_OVER:
             # Safety break for infinite loops
             if state.day > 100:
                 break
+            _PHASE_HANDLERS[state.phase](self, state, strategy)
+
+        # record_event serialized each event as it was recorded
+        self.history = state.history
+
+    def _handle_night_wolf(self, state: GameState, strategy: SimpleStrategy) -> None:
+        wolf_id = self.get_first_alive_by_role(state, Role.WOLF)
+        if wolf_id is not None:
+            rec = strategy.recommend(state, wolf_id)
+            apply_action(state, rec.action, recommendation=rec)
+        else:
+            state.phase = Phase.NIGHT_SEER
+
+    def _handle_night_seer(self, state: GameState, strategy: SimpleStrategy) -> None:
+        seer_id = self.get_first_alive_by_role(state, Role.SEER)
+        if seer_id is not None:
+            rec = strategy.recommend(state, seer_id)
+            apply_action(state, rec.action, recommendation=rec)
+        else:
+            state.phase = Phase.NIGHT_WITCH
+
+    def _handle_night_witch(self, state: GameState, strategy: SimpleStrategy) -> None:
+        witch_id = self.get_first_by_role(state, Role.WITCH)
+        if witch_id is not None:
+            rec = strategy.recommend(state, witch_id)
+            apply_action(state, rec.action, recommendation=rec)
+        
+        self.resolve_hunter_shots(state, strategy)
+        self.finalize_after_hunter(state)
+        
+        if state.phase is not _GAME_OVER:
+            state.phase = Phase.DAY_DISCUSS
+
+    def _handle_day_discuss(self, state: GameState, strategy: SimpleStrategy) -> None:
+        # Everyone speaks once in order
+        speakers = alive_players(state)
+        for speaker in speakers:
+            if state.phase is _GAME_OVER: break
+            rec = strategy.recommend(state, speaker.player_id)
+            apply_action(state, rec.action, recommendation=rec)
+        
+        if state.phase is not _GAME_OVER:
+            state.phase = Phase.DAY_VOTE
 
-            if state.phase == Phase.NIGHT_WOLF:
-                wolf_id = self.get_first_alive_by_role(state, Role.WOLF)
-                if wolf_id is not None:
-                    rec = strategy.recommend(state, wolf_id)
-                    apply_action(state, rec.action, recommendation=rec)
-                else:
-                    state.phase = Phase.NIGHT_SEER
-            elif state.phase == Phase.NIGHT_SEER:
-                seer_id = self.get_first_alive_by_role(state, Role.SEER)
-                if seer_id is not None:
-                    rec = strategy.recommend(state, seer_id)
-                    apply_action(state, rec.action, recommendation=rec)
-                else:
-                    state.phase = Phase.NIGHT_WITCH
-            elif state.phase == Phase.NIGHT_WITCH:
-                witch_id = self.get_first_by_role(state, Role.WITCH)
-                if witch_id is not None:
-                    rec = strategy.recommend(state, witch_id)
-                    apply_action(state, rec.action, recommendation=rec)
-                
-                self.resolve_hunter_shots(state, strategy)
-                self.finalize_after_hunter(state)
-                
-                if state.phase != Phase.GAME_OVER:
-                    state.phase = Phase.DAY_DISCUSS
-
-            elif state.phase == Phase.DAY_DISCUSS:
-                # Everyone speaks once in order
-                speakers = alive_players(state)
-                for speaker in speakers:
-                    if state.phase == Phase.GAME_OVER: break
-                    rec = strategy.recommend(state, speaker.player_id)
-                    apply_action(state, rec.action, recommendation=rec)
-                
-                if state.phase != Phase.GAME_OVER:
-                    state.phase = Phase.DAY_VOTE
-                    
-            elif state.phase == Phase.DAY_VOTE:
-                vote_map = {}
-                vote_reasons = {}
-                
-                # Collect votes
-                for p in alive_players(state):
-                    vote_target = strategy.choose_vote_target(state, p.player_id)
-                    if vote_target is not None:
-                        vote_map[p.player_id] = vote_target
-                        # Get reason
-                        action = Action(action_type=ActionType.VOTE, actor_id=p.player_id, target_id=vote_target)
-                        reason = strategy._generate_reason(state, p.player_id, action)
-                        vote_reasons[p.player_id] = reason
-                
-                # Tally votes
-                vote_counts = {}
-                for target in vote_map.values():
-                    vote_counts[target] = vote_counts.get(target, 0) + 1
-                
-                description = "投票结束"
-                exiled_player = None
-                
-                if vote_counts:
-                    sorted_votes = sorted(vote_counts.items(), key=lambda x: x[1], reverse=True)
-                    top_target, top_count = sorted_votes[0]
-                    
-                    # Check tie
-                    is_tie = False
-                    if len(sorted_votes) > 1 and sorted_votes[1][1] == top_count:
-                        is_tie = True
-                    
-                    if not is_tie:
-                        exiled_player = top_target
-                        description = f"投票结果：放逐玩家 {exiled_player}"
-                    else:
-                        description = "投票结果：平票，无人被放逐"
-                else:
-                    description = "无人投票"
-                
-                # Record VOTE event
-                # Convert keys to int for event record if needed, but they are ints
-                record_event(state, description, target_id=exiled_player, votes=vote_map, vote_reasons=vote_reasons)
-                
-                # Execute Exile
-                if exiled_player is not None:
-                    kill_player(state, exiled_player, reason="VOTE")
-                
-                self.resolve_hunter_shots(state, strategy)
-                self.finalize_after_hunter(state)
-
-                if state.phase != Phase.GAME_OVER:
-                    state.day += 1
-                    state.phase = Phase.NIGHT_WOLF
-
-        # Populate history
-        self.history = []
-        for e in state.public_events:
-            rec_data = None
-            if e.recommendation:
-                rec_data = {
-                    "win_rate": e.recommendation.win_rate_estimate,
-                    "reason": e.recommendation.reason
-                }
+    def _handle_day_vote(self, state: GameState, strategy: SimpleStrategy) -> None:
+        vote_map = {}
+        vote_reasons = {}
+        
+        # Collect votes (nobody dies while votes are collected)
+        voters = alive_players(state)
+        for p in voters:
+            vote_target = strategy.choose_vote_target(state, p.player_id)
+            if vote_target is not None:
+                vote_map[p.player_id] = vote_target
+                # Get reason
+                action = Action(action_type=ActionType.VOTE, actor_id=p.player_id, target_id=vote_target)
+                reason = strategy.generate_reason(state, p.player_id, action)
+                vote_reasons[p.player_id] = reason
+        
+        # Tally votes
+        vote_counts = Counter(vote_map.values())
+        
+        description = "投票结束"
+        exiled_player = None
+        
+        if vote_counts:
+            top_votes = vote_counts.most_common(2)
+            top_target, top_count = top_votes[0]
+            
+            # Check tie
+            is_tie = len(top_votes) > 1 and top_votes[1][1] == top_count
             
-            self.history.append({
-                "day": e.day,
-                "phase": e.phase.value,
-                "description": e.description,
-                "actor_id": e.actor_id,
-                "target_id": e.target_id,
-                "votes": e.votes,
-                "recommendation": rec_data
-            })
+            if not is_tie:
+                exiled_player = top_target
+                description = f"投票结果：放逐玩家 {exiled_player}"
+            else:
+                description = "投票结果：平票，无人被放逐"
+        else:
+            description = "无人投票"
+        
+        # Record VOTE event (voter -> target, int keys; json.dumps stringifies them for the UI)
+        record_event(state, description, target_id=exiled_player, votes=vote_map, vote_reasons=vote_reasons, death_cause="VOTE" if exiled_player is not None else None)
+        
+        # Execute Exile
+        if exiled_player is not None:
+            kill_player(state, exiled_player, reason="VOTE")
+        
+        self.resolve_hunter_shots(state, strategy)
+        self.finalize_after_hunter(state)
+
+        if state.phase is not _GAME_OVER:
+            state.day += 1
+            state.phase = Phase.NIGHT_WOLF
 
     def record_history(self, state: GameState):
         pass
 
     def get_first_alive_by_role(self, state: GameState, role: Role) -> Optional[int]:
-        for p in state.players:
-            if p.role == role and p.alive:
-                return p.player_id
-        return None
+        alive_mask = state.alive_mask
+        return next((pid for pid in state.players_by_role.get(role, ()) if (alive_mask >> pid) & 1), None)
 
     def get_first_by_role(self, state: GameState, role: Role) -> Optional[int]:
-        for p in state.players:
-            if p.role == role:
-                return p.player_id
-        return None
+        pids = state.players_by_role.get(role)
+        return pids[0] if pids else None
 
     def resolve_hunter_shots(self, state: GameState, strategy: SimpleStrategy) -> None:
-        while True:
-            unshot = get_unshot_dead_hunters(state)
-            if not unshot:
-                break
-            for hunter in unshot:
-                target_id = strategy.choose_hunter_shot(state, hunter.player_id)
-                record_event(state, "猎人开枪", actor_id=hunter.player_id, target_id=target_id)
-                if target_id is not None:
-                    kill_player(state, target_id, reason="HUNTER")
+        # kill_player queues each hunter as they die, so a hunter shot by
+        # another hunter is picked up by this same loop.
+        pending = state.pending_hunter_shots
+        while pending:
+            hunter_id = pending.popleft()
+            target_id = strategy.choose_hunter_shot(state, hunter_id)
+            record_event(state, "猎人开枪", actor_id=hunter_id, target_id=target_id, death_cause="HUNTER" if target_id is not None else None)
+            state.shot_hunters.add(hunter_id)
+            kill_player(state, target_id, reason="HUNTER")
     
     def finalize_after_hunter(self, state: GameState) -> None:
-        if state.phase == Phase.GAME_OVER:
+        if state.phase is _GAME_OVER:
             return
         winner = check_winner(state)
         if winner is not None:
@@ -185,6 +167,16 @@ class GameSimulator:
             record_event(state, "游戏结束")
 
 
+# One handler per phase; each advances state.phase itself.
+_PHASE_HANDLERS = {
+    Phase.NIGHT_WOLF: GameSimulator._handle_night_wolf,
+    Phase.NIGHT_SEER: GameSimulator._handle_night_seer,
+    Phase.NIGHT_WITCH: GameSimulator._handle_night_witch,
+    Phase.DAY_DISCUSS: GameSimulator._handle_day_discuss,
+    Phase.DAY_VOTE: GameSimulator._handle_day_vote,
+}
+
+
 def run_game(seed: int = None, player_count: int = 9) -> GameState:
     state, rng = create_default_game(seed=seed, player_count=player_count)
     roles = {p.player_id: p.role for p in state.players}
@@ -196,5 +188,39 @@ def run_game(seed: int = None, player_count: int = 9) -> GameState:
     simulator.run()
     return state
 
+def _simulate_one(seed: int, player_count: int) -> Dict:
+    state = run_game(seed, player_count)
+    return {
+        "seed": seed,
+        "winner": state.winner.name if state.winner else None,
+        "days": state.day,
+        "events": len(state.public_events),
+    }
+
+
+def run_batch(seeds: List[int], player_count: int = 9, workers: Optional[int] = None) -> List[Dict]:
+    """Play one game per seed across worker processes; results follow seed order.
+
+    Falls back to playing them in this process where worker processes are
+    unavailable (Pyodide) or when workers == 1.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(seeds) > 1:
+        try:
+            from concurrent.futures import ProcessPoolExecutor
+            from concurrent.futures.process import BrokenProcessPool
+        except ImportError:
+            pass
+        else:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunksize = max(1, len(seeds) // (workers * 4))
+                    return list(executor.map(_simulate_one, seeds, repeat(player_count), chunksize=chunksize))
+            except (NotImplementedError, OSError, BrokenProcessPool):
+                # No usable worker processes, or one died: play them here
+                pass
+    return [_simulate_one(seed, player_count) for seed in seeds]
+
+
 def get_view(state: GameState, player_id: int) -> dict:
     return get_player_view(state, player_id)
@@ -1,108 +1,296 @@
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 import random
+import re
 
-from .models import Action, ActionType, GameState, Phase, Role, Recommendation, Statement, PlayerPrivate, Faction
-from .engine import alive_players, get_player, role_of
+from .models import Action, ActionType, Event, GameState, Phase, Player, Role, Recommendation, Statement, PlayerPrivate, Faction
+from .engine import alive_players
 from .estimation import WinRateEstimator
 
+# Upper bound on cached win-rate estimates per strategy (LRU).
+WIN_RATE_CACHE_SIZE = 1 << 17
+
+# Static reasons keyed by (action type, claimed role, speech tag).
+# Only votes need per-call formatting; see SimpleStrategy._vote_reason.
+_REASON_TABLE: Dict[Tuple[ActionType, Optional[Role], Optional[str]], str] = {
+    (ActionType.KILL, None, None): "狼人策略：随机选择一名非狼人玩家进行击杀（基础策略）",
+    (ActionType.CHECK, None, None): "预言家策略：优先查验未知身份的存活玩家",
+    (ActionType.SAVE, None, None): "女巫策略：解药可用，发现有人倒牌，决定使用解药救人（银水）",
+    (ActionType.POISON, None, None): "女巫策略：发现确定的狼人目标，使用毒药",
+    (ActionType.SPEAK, Role.SEER, "wolf"): "狼人策略（悍跳）：假装预言家，混淆视听，争取抗推位",
+    (ActionType.SPEAK, Role.SEER, "seer"): "预言家策略：诚实报告查验结果（金水/查杀），构建逻辑链",
+    (ActionType.SPEAK, Role.WITCH, None): "女巫策略：跳身份带队，报告银水信息",
+    (ActionType.SPEAK, None, "过"): "平民策略（深水/隐身）：没有特别信息，选择划水，避免成为焦点",
+    (ActionType.SPEAK, None, None): "常规发言",
+}
+
+# Silver Water reported in a Witch claim: "救了 X"
+_SAVED_RE = re.compile(r"救了\s*(\d+)")
+
+# Accusations in a player's own speech: "我觉得 X ..." first, else "X 是狼 ...".
+# Anchored so the first alternative wins whenever it matches anywhere.
+_SPEECH_RE = re.compile(r"^(?:.*?(?:我觉得|我怀疑|认出|认为|建议查杀).*?(\d+)|.*?(\d+).*?(?:是狼|铁狼|悍跳|可疑))")
+
+
+@dataclass(slots=True)
+class StateDerivedCache:
+    """
+    Facts derived from the public event log in a single pass, plus a
+    snapshot of who is alive. Claim lists are not alive-filtered; callers
+    test alive_mask.
+    """
+    state: GameState  # Held so id(state) cannot be reused while cached
+    alive: List[Player] = field(default_factory=list)
+    alive_mask: int = 0  # Bit pid set <=> player pid alive
+    known_seers: List[int] = field(default_factory=list)  # Seer claimers, first claim first
+    known_witches: List[int] = field(default_factory=list)
+    known_gods: List[int] = field(default_factory=list)  # Witch / Hunter claimers
+    seer_claims: List[Statement] = field(default_factory=list)  # In event order
+    seer_claims_by_player: Dict[int, List[Statement]] = field(default_factory=dict)
+    latest_seer_claim: Optional[Statement] = None
+    saved_ids: Set[int] = field(default_factory=set)  # Reported by Witch claims ("救了 X")
+    witch_saves: Dict[int, Event] = field(default_factory=dict)  # actor -> latest save event
+    witch_poisons: Dict[int, Event] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, state: GameState) -> "StateDerivedCache":
+        d = cls(state)
+        d.alive = alive_players(state)
+        d.alive_mask = state.alive_mask
+        for e, claimed in zip(state.public_events, state.event_claimed_roles):
+            if "使用了解药" in e.description:
+                d.witch_saves[e.actor_id] = e
+            elif "使用了毒药" in e.description:
+                d.witch_poisons[e.actor_id] = e
+            if not claimed:
+                continue
+            stmt = e.statement
+            claimer = stmt.actor_id
+            if claimed == Role.SEER:
+                if claimer not in d.seer_claims_by_player:
+                    d.known_seers.append(claimer)
+                    d.seer_claims_by_player[claimer] = []
+                d.seer_claims_by_player[claimer].append(stmt)
+                d.seer_claims.append(stmt)
+                d.latest_seer_claim = stmt
+            elif claimed in (Role.WITCH, Role.HUNTER):
+                if claimer not in d.known_gods:
+                    d.known_gods.append(claimer)
+                if claimed == Role.WITCH:
+                    if claimer not in d.known_witches:
+                        d.known_witches.append(claimer)
+                    match = _SAVED_RE.search(stmt.content)
+                    if match:
+                        d.saved_ids.add(int(match.group(1)))
+        return d
+
+
 @dataclass
 class SimpleStrategy:
     rng: random.Random
-    estimator: WinRateEstimator = field(default_factory=lambda: WinRateEstimator(num_simulations=50))
+    # Defaults to an estimator drawing from self.rng, so one seeded stream
+    # drives both decisions and rollouts.
+    estimator: Optional[WinRateEstimator] = None
+    # One entry, keyed by (id(state), len(state.public_events), state.deaths);
+    # the log only grows and players only die.
+    _cache: Dict[Tuple[int, int, int], StateDerivedCache] = field(default_factory=dict, init=False, repr=False)
+    # Win rates by WinRateEstimator.position_key. Actions are not cached: choosing
+    # one draws from rng and may spend a potion.
+    _win_rate_cache: OrderedDict = field(default_factory=OrderedDict, init=False, repr=False)
+    _phase_dispatch: Dict[Phase, Callable[[GameState, int], Action]] = field(init=False, repr=False)
+    _reason_dispatch: Dict[ActionType, Callable[[GameState, int, Action], str]] = field(init=False, repr=False)
+    # Per-game tables for _game_state, rebuilt by _bind_game() when the state
+    # changes. Roles are fixed for a game, so night phases only map for the
+    # role that acts in them.
+    _actor_handlers: Dict[Tuple[int, Phase], Callable[[GameState, int], Action]] = field(default_factory=dict, init=False, repr=False)
+    _roles: Dict[int, Role] = field(default_factory=dict, init=False, repr=False)
+    _wolf_mask: int = field(default=0, init=False, repr=False)  # Bit pid set <=> pid is a wolf
+    _game_state: Optional[GameState] = field(default=None, init=False, repr=False)
+    # Candidate ids for random picks, overwritten in place by _collect()
+    _scratch: List[int] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.estimator is None:
+            self.estimator = WinRateEstimator(num_simulations=50, rng=self.rng)
+        # Jump tables replacing the phase / action-type if-chains
+        self._phase_dispatch = {
+            Phase.NIGHT_WOLF: self.choose_wolf_kill,
+            Phase.NIGHT_SEER: self.choose_seer_check,
+            Phase.NIGHT_WITCH: self.choose_witch_action,
+            Phase.DAY_DISCUSS: self.choose_statement,
+            Phase.DAY_VOTE: self._vote_action,
+        }
+        # Action types without a static entry in _REASON_TABLE
+        self._reason_dispatch = {
+            ActionType.SPEAK: self._speak_reason,
+            ActionType.VOTE: self._vote_reason,
+        }
+
+    def _derive(self, state: GameState) -> StateDerivedCache:
+        key = (id(state), len(state.public_events), state.deaths)
+        derived = self._cache.get(key)
+        if derived is None:
+            derived = StateDerivedCache.build(state)
+            self._cache.clear()
+            self._cache[key] = derived
+        return derived
 
     def recommend(self, state: GameState, actor_id: int) -> Recommendation:
         # Wrapper to return Recommendation object
         action = self._choose_action(state, actor_id)
-        reason = self._generate_reason(state, actor_id, action)
-        win_rate = self.estimator.estimate(state, actor_id)
+        reason = self.generate_reason(state, actor_id, action)
+        win_rate = self._estimate_win_rate(state, actor_id)
         return Recommendation(action=action, reason=reason, win_rate_estimate=win_rate)
 
+    def _estimate_win_rate(self, state: GameState, actor_id: int) -> float:
+        key = self.estimator.position_key(state, actor_id)
+        cache = self._win_rate_cache
+        win_rate = cache.get(key)
+        if win_rate is not None:
+            cache.move_to_end(key)
+            return win_rate
+        win_rate = self.estimator.estimate(state, actor_id)
+        cache[key] = win_rate
+        if len(cache) > WIN_RATE_CACHE_SIZE:
+            cache.popitem(last=False)
+        return win_rate
+
+    def _collect(self, ids: Iterable[int]) -> int:
+        """Write ids into the scratch buffer and return how many were written."""
+        buf = self._scratch
+        size = len(buf)
+        k = 0
+        for pid in ids:
+            if k < size:
+                buf[k] = pid
+            else:
+                buf.append(pid)
+            k += 1
+        return k
+
+    def _pick(self, k: int) -> int:
+        # Same draw as rng.choice() over the first k collected ids
+        return self._scratch[self.rng.randrange(k)]
+
+    def _bind_game(self, state: GameState) -> None:
+        dispatch = self._phase_dispatch
+        night_phase = {
+            Role.WOLF: Phase.NIGHT_WOLF,
+            Role.SEER: Phase.NIGHT_SEER,
+            Role.WITCH: Phase.NIGHT_WITCH,
+        }
+        handlers = {}
+        for p in state.players:
+            phase = night_phase.get(p.role)
+            if phase is not None:
+                handlers[(p.player_id, phase)] = dispatch[phase]
+            handlers[(p.player_id, Phase.DAY_DISCUSS)] = dispatch[Phase.DAY_DISCUSS]
+            handlers[(p.player_id, Phase.DAY_VOTE)] = dispatch[Phase.DAY_VOTE]
+        self._actor_handlers = handlers
+        self._roles = state.roles_by_id
+        self._wolf_mask = 0
+        for p in state.players:
+            if p.role == Role.WOLF:
+                self._wolf_mask |= 1 << p.player_id
+        self._game_state = state
+
+    def _roles_of(self, state: GameState) -> Dict[int, Role]:
+        if self._game_state is not state:
+            self._bind_game(state)
+        return self._roles
+
+    def _wolf_mask_of(self, state: GameState) -> int:
+        if self._game_state is not state:
+            self._bind_game(state)
+        return self._wolf_mask
+
     def _choose_action(self, state: GameState, actor_id: int) -> Action:
-        if state.phase == Phase.NIGHT_WOLF:
-            return self.choose_wolf_kill(state, actor_id)
-        if state.phase == Phase.NIGHT_SEER:
-            return self.choose_seer_check(state, actor_id)
-        if state.phase == Phase.NIGHT_WITCH:
-            return self.choose_witch_action(state, actor_id)
-        if state.phase == Phase.DAY_DISCUSS:
-            return self.choose_statement(state, actor_id)
-        if state.phase == Phase.DAY_VOTE:
-            target_id = self.choose_vote_target(state, actor_id)
-            return Action(action_type=ActionType.VOTE, actor_id=actor_id, target_id=target_id)
+        if self._game_state is not state:
+            self._bind_game(state)
+        return self._actor_handlers.get((actor_id, state.phase), self._pass_action)(state, actor_id)
+
+    def _vote_action(self, state: GameState, actor_id: int) -> Action:
+        target_id = self.choose_vote_target(state, actor_id)
+        return Action(action_type=ActionType.VOTE, actor_id=actor_id, target_id=target_id)
+
+    def _pass_action(self, state: GameState, actor_id: int) -> Action:
         return Action(action_type=ActionType.PASS, actor_id=actor_id)
 
-    def _generate_reason(self, state: GameState, actor_id: int, action: Action) -> str:
-        if action.action_type == ActionType.KILL:
-            return "狼人策略：随机选择一名非狼人玩家进行击杀（基础策略）"
-        if action.action_type == ActionType.CHECK:
-            return "预言家策略：优先查验未知身份的存活玩家"
-        if action.action_type == ActionType.SAVE:
-            return "女巫策略：解药可用，发现有人倒牌，决定使用解药救人（银水）"
-        if action.action_type == ActionType.POISON:
-            return "女巫策略：发现确定的狼人目标，使用毒药"
-        if action.action_type == ActionType.SPEAK:
-            stmt = action.statement
-            if stmt.claimed_role == Role.SEER:
-                if role_of(state, actor_id) == Role.WOLF:
-                    return "狼人策略（悍跳）：假装预言家，混淆视听，争取抗推位"
-                else:
-                    return "预言家策略：诚实报告查验结果（金水/查杀），构建逻辑链"
-            if stmt.claimed_role == Role.WITCH:
-                return "女巫策略：跳身份带队，报告银水信息"
-            if stmt.content == "过":
-                return "平民策略（深水/隐身）：没有特别信息，选择划水，避免成为焦点"
-            return "常规发言"
-        if action.action_type == ActionType.VOTE:
-            # Check trust scores
-            private = state.private_info[actor_id]
-            my_role = role_of(state, actor_id)
-            
-            # Wolf specific reasons
-            if my_role == Role.WOLF:
-                target_role = role_of(state, action.target_id)
-                if target_role in [Role.SEER, Role.WITCH, Role.HUNTER]:
-                    return f"狼人策略：目标 {action.target_id} 是神职（{target_role.value}），优先放逐"
-                else:
-                    return f"狼人策略：目标 {action.target_id} 是好人，试图将其抗推"
+    def generate_reason(self, state: GameState, actor_id: int, action: Action) -> str:
+        # SPEAK also has a static (SPEAK, None, None) fallback, so consult the
+        # dispatch first or it would shadow the claim-specific reasons
+        handler = self._reason_dispatch.get(action.action_type)
+        if handler is not None:
+            return handler(state, actor_id, action)
+        return _REASON_TABLE.get((action.action_type, None, None), "常规行动")
 
-            # 1. Vote known wolves (Seer logic)
-            known_wolves = [pid for pid, is_wolf in private.seer_results.items() if is_wolf and get_player(state, pid).alive]
-            if action.target_id in known_wolves:
-                return f"投票理由：目标 {action.target_id} 是已查验的狼人（铁狼）"
-            
-            # 2. Witch Silver Water Logic
-            if my_role == Role.WITCH and private.witch_state.saved_player_id is not None:
-                # If voting for someone who is NOT Silver Water, but is attacking Silver Water?
-                # Actually if we are voting for X, and X claimed Seer (but is not Silver Water), say it.
-                if action.target_id in private.known_seers:
-                     saved = private.witch_state.saved_player_id
-                     if saved != action.target_id and saved in private.known_seers:
-                         return f"女巫策略：银水是 {saved}，目标 {action.target_id} 对跳预言家，定为悍跳狼"
-
-            # 3. Stand-side Logic
-            if action.target_id in private.known_seers:
-                # If I am voting for a Seer, explain why.
-                # If I have a trusted Seer (e.g. Silver Water), and I vote for another.
-                if private.believed_silver_water:
-                    silver = private.believed_silver_water
-                    if silver != action.target_id:
-                         # Logic Check: Did the one I support verify Silver Water?
-                         # If trusted_seer (supported) verified Silver Water, say it.
-                         return f"投票理由：相信女巫的银水 {silver} 是好人，支持验其为好人的预言家，放逐悍跳狼 {action.target_id}"
-                
-                return f"投票理由：站边逻辑，不相信目标 {action.target_id} 的预言家身份（信赖度低）"
+    def _speak_reason(self, state: GameState, actor_id: int, action: Action) -> str:
+        stmt = action.statement
+        claimed = stmt.claimed_role
+        if claimed == Role.SEER:
+            tag = "wolf" if self._roles_of(state)[actor_id] == Role.WOLF else "seer"
+        elif claimed == Role.WITCH:
+            tag = None
+        else:
+            claimed = None
+            tag = "过" if stmt.content == "过" else None
+        return _REASON_TABLE[(ActionType.SPEAK, claimed, tag)]
+
+    def _vote_reason(self, state: GameState, actor_id: int, action: Action) -> str:
+        alive_mask = self._derive(state).alive_mask
+        # Check trust scores
+        private = state.private_info[actor_id]
+        roles = self._roles_of(state)
+        my_role = roles[actor_id]
+        
+        # Wolf specific reasons
+        if my_role == Role.WOLF:
+            target_role = roles[action.target_id]
+            if target_role in [Role.SEER, Role.WITCH, Role.HUNTER]:
+                return f"狼人策略：目标 {action.target_id} 是神职（{target_role.name}），优先放逐"
+            else:
+                return f"狼人策略：目标 {action.target_id} 是好人，试图将其抗推"
 
-            # 4. Vote lowest trust (Belief logic)
-            if action.target_id in private.trust_scores:
-                score = private.trust_scores[action.target_id]
-                if score < 0.4:
-                    return f"投票理由：目标 {action.target_id} 的信赖度极低 ({score:.2f})，怀疑是悍跳狼或倒钩狼"
+        # 1. Vote known wolves (Seer logic)
+        target = action.target_id
+        if target is not None and (private.seer_wolves_mask >> target) & 1 and (alive_mask >> target) & 1:
+            return f"投票理由：目标 {action.target_id} 是已查验的狼人（铁狼）"
+        
+        seers_mask = private.known_seers_mask
+        target_is_seer = target is not None and (seers_mask >> target) & 1
+        
+        # 2. Witch Silver Water Logic
+        if my_role == Role.WITCH and private.witch_state.saved_player_id is not None:
+            # If voting for someone who is NOT Silver Water, but is attacking Silver Water?
+            # Actually if we are voting for X, and X claimed Seer (but is not Silver Water), say it.
+            if target_is_seer:
+                 saved = private.witch_state.saved_player_id
+                 if saved != action.target_id and (seers_mask >> saved) & 1:
+                     return f"女巫策略：银水是 {saved}，目标 {action.target_id} 对跳预言家，定为悍跳狼"
+
+        # 3. Stand-side Logic
+        if target_is_seer:
+            # If I am voting for a Seer, explain why.
+            # If I have a trusted Seer (e.g. Silver Water), and I vote for another.
+            if private.believed_silver_water:
+                silver = private.believed_silver_water
+                if silver != action.target_id:
+                     # Logic Check: Did the one I support verify Silver Water?
+                     # If trusted_seer (supported) verified Silver Water, say it.
+                     return f"投票理由：相信女巫的银水 {silver} 是好人，支持验其为好人的预言家，放逐悍跳狼 {action.target_id}"
             
-            return "投票理由：没有明确线索，随机投票（避免弃票）"
-        return "常规行动"
+            return f"投票理由：站边逻辑，不相信目标 {action.target_id} 的预言家身份（信赖度低）"
+
+        # 4. Vote lowest trust (Belief logic)
+        if action.target_id in private.trust_scores:
+            score = private.trust_scores[action.target_id]
+            if score < 0.4:
+                return f"投票理由：目标 {action.target_id} 的信赖度极低 ({score:.2f})，怀疑是悍跳狼或倒钩狼"
+        
+        return "投票理由：没有明确线索，随机投票（避免弃票）"
 
     def choose_wolf_kill(self, state: GameState, actor_id: int) -> Action:
         # Advanced Logic:
@@ -110,43 +298,29 @@ class SimpleStrategy:
         # 2. Kill high-trust good players (Gold Water).
         # 3. Avoid killing deep water wolves (obviously).
         
-        # Identify targets
-        targets = [p.player_id for p in alive_players(state) if p.role != Role.WOLF]
-        
         # Check if we know any roles (e.g. from open claims)
-        # We need to scan public events for role claims
-        known_seers = []
-        known_witches = []
-        
-        for e in state.public_events:
-            if e.statement and e.statement.claimed_role:
-                claimer = e.statement.actor_id
-                if get_player(state, claimer).alive:
-                    if e.statement.claimed_role == Role.SEER:
-                        known_seers.append(claimer)
-                    elif e.statement.claimed_role == Role.WITCH:
-                        known_witches.append(claimer)
+        d = self._derive(state)
         
         # Priority: Real Seer > Witch > Random
         # But Wolf doesn't know who is Real Seer if there is a jump.
         # Actually Wolf knows who is NOT wolf. If two people claim Seer, and one is Wolf teammate, the other is Real Seer.
         
-        real_seers = [pid for pid in known_seers if role_of(state, pid) != Role.WOLF]
-        real_witches = [pid for pid in known_witches if role_of(state, pid) != Role.WOLF]
-        
-        priority_targets = real_seers + real_witches
+        targets_mask = d.alive_mask & ~self._wolf_mask_of(state)
+        target_id = next((pid for pid in d.known_seers + d.known_witches if (targets_mask >> pid) & 1), None)
         
-        if priority_targets:
-            target_id = priority_targets[0]
-        elif targets:
-            target_id = self.rng.choice(targets)
-        else:
-            return Action(action_type=ActionType.PASS, actor_id=actor_id)
+        if target_id is None:
+            # Identify targets
+            k = self._collect(p.player_id for p in d.alive if (targets_mask >> p.player_id) & 1)
+            if not k:
+                return Action(action_type=ActionType.PASS, actor_id=actor_id)
+            target_id = self._pick(k)
             
         return Action(action_type=ActionType.KILL, actor_id=actor_id, target_id=target_id)
 
     def choose_seer_check(self, state: GameState, actor_id: int) -> Action:
+        alive_mask = self._derive(state).alive_mask
         private = state.private_info[actor_id]
+        checked_mask = private.seer_checked_mask
         
         # Priority:
         # 1. Check active Seer claimers (Counter-Jumpers)
@@ -154,40 +328,36 @@ class SimpleStrategy:
         # 3. Check random active players (High profile)
         # 4. Random unchecked
         
-        candidates = []
-        
         # 1. Counter-Jumpers
-        for pid in private.known_seers:
-            if pid != actor_id and pid not in private.seer_results and get_player(state, pid).alive:
-                candidates.append(pid)
+        k = self._collect(pid for pid in private.known_seers
+                          if pid != actor_id and not (checked_mask >> pid) & 1 and (alive_mask >> pid) & 1)
         
-        if candidates:
-            target = self.rng.choice(candidates)
+        if k:
+            target = self._pick(k)
             return Action(action_type=ActionType.CHECK, actor_id=actor_id, target_id=target)
             
         # 2. Low Trust / Suspects
         # Check people who others are suspecting?
         # Or people I distrust.
-        suspects = []
-        for pid, score in private.trust_scores.items():
-            if score < 0.4 and pid not in private.seer_results and get_player(state, pid).alive:
-                suspects.append(pid)
+        k = self._collect(pid for pid, score in private.trust_scores.items()
+                          if score < 0.4 and not (checked_mask >> pid) & 1 and (alive_mask >> pid) & 1)
         
-        if suspects:
-            target = self.rng.choice(suspects)
+        if k:
+            target = self._pick(k)
             return Action(action_type=ActionType.CHECK, actor_id=actor_id, target_id=target)
             
         # 3. Random unchecked
-        alive = alive_players(state)
-        unchecked = [p.player_id for p in alive if p.player_id not in private.seer_results and p.player_id != actor_id]
+        alive = self._derive(state).alive
+        k = self._collect(p.player_id for p in alive if not (checked_mask >> p.player_id) & 1 and p.player_id != actor_id)
         
-        if unchecked:
-            target_id = self.rng.choice(unchecked)
+        if k:
+            target_id = self._pick(k)
             return Action(action_type=ActionType.CHECK, actor_id=actor_id, target_id=target_id)
             
         return Action(action_type=ActionType.PASS, actor_id=actor_id)
 
     def choose_witch_action(self, state: GameState, actor_id: int) -> Action:
+        alive_mask = self._derive(state).alive_mask
         private = state.private_info[actor_id]
         
         # 1. Save Logic
@@ -214,7 +384,7 @@ class SimpleStrategy:
             
             # Priority A: Known Wolves (Seer checked)
             for pid, is_wolf in private.seer_results.items():
-                if is_wolf and get_player(state, pid).alive:
+                if is_wolf and (alive_mask >> pid) & 1:
                     target_to_poison = pid
                     break
             
@@ -225,19 +395,19 @@ class SimpleStrategy:
                 # 2. Lowest trust score
                 
                 # Check for Fake Seer (Jump Wolf)
-                alive_seers = [pid for pid in private.known_seers if get_player(state, pid).alive]
+                alive_seers = [pid for pid in private.known_seers if (alive_mask >> pid) & 1]
                 if alive_seers:
                     # If I have a trusted seer (e.g. Silver Water confirmed), poison the other(s)
                     # Or poison the one with lowest trust
-                    alive_seers.sort(key=lambda pid: private.trust_scores.get(pid, 0.5))
-                    target_to_poison = alive_seers[0] # Lowest trust seer
+                    trust = private.trust_scores
+                    target_to_poison = min(alive_seers, key=lambda pid: trust.get(pid, 0.5)) # Lowest trust seer
                 
                 # If no Seer candidate or still None, pick lowest trust overall
                 if target_to_poison is None:
-                    candidates = [p.player_id for p in alive_players(state) if p.player_id != actor_id]
-                    candidates.sort(key=lambda pid: private.trust_scores.get(pid, 0.5))
+                    candidates = [p.player_id for p in self._derive(state).alive if p.player_id != actor_id]
                     if candidates:
-                        target_to_poison = candidates[0]
+                        trust = private.trust_scores
+                        target_to_poison = min(candidates, key=lambda pid: trust.get(pid, 0.5))
             
             if target_to_poison is not None:
                 private.witch_state.poison_used = True
@@ -246,81 +416,9 @@ class SimpleStrategy:
         return Action(action_type=ActionType.PASS, actor_id=actor_id)
 
 
-    def choose_hunter_shot(self, state: GameState, actor_id: int) -> Optional[int]:
-        candidates = [p.player_id for p in alive_players(state) if p.player_id != actor_id]
-        if not candidates:
-            return None
-            
-        # Priority:
-        # 1. Someone who voted for me in the last vote phase?
-        # 2. Someone who claimed Seer and checked me as Wolf (Fake Seer).
-        # 3. Lowest trust score.
-        
-        # Check Public Events for voters/accusers
-        enemies = []
-        
-        for e in state.public_events:
-            # Check for votes against me
-            if e.votes:
-                for voter_str, target_id in e.votes.items():
-                    if target_id == actor_id:
-                        voter = int(voter_str)
-                        if get_player(state, voter).alive:
-                            enemies.append(voter)
-            
-            # Check for false accusations
-            if e.statement and e.statement.claimed_role == Role.SEER:
-                if actor_id in e.statement.claimed_checks:
-                    is_wolf = e.statement.claimed_checks[actor_id]
-                    if is_wolf: # They said I am Wolf!
-                        speaker = e.statement.actor_id
-                        if get_player(state, speaker).alive:
-                            enemies.append(speaker)
-                            
-        if enemies:
-            # Prioritize latest enemies? Or most frequent?
-            # Just pick random enemy for now.
-            return self.rng.choice(enemies)
-            
-        # Fallback: Lowest trust
-        private = state.private_info[actor_id]
-        
-        # HUNTER SPECIAL: If there is a suspicious Seer (Jump Wolf), shoot him.
-        # Especially if I am dying at night (likely Wolf Kill).
-        # If I am dying, and there is a "Seer" alive who is distrusted.
-        
-        # Find alive Seers
-        alive_seers = [pid for pid in private.known_seers if get_player(state, pid).alive]
-        if len(alive_seers) == 1:
-            # Only one Seer left. Is he trusted?
-            seer = alive_seers[0]
-            if private.trust_scores.get(seer, 0.5) < 0.4:
-                return seer # Shoot the fake seer
-        elif len(alive_seers) > 1:
-             # Multiple seers. Shoot the one I distrust most.
-             # Or shoot the one who is NOT Silver Water supported.
-             alive_seers.sort(key=lambda pid: private.trust_scores.get(pid, 0.5))
-             return alive_seers[0] # Shoot lowest trust
-        
-        lowest_score = 1.0
-        lowest_target = -1
-        found_low = False
-        
-        for cand in candidates:
-            score = private.trust_scores.get(cand, 0.5)
-            if score < lowest_score:
-                lowest_score = score
-                lowest_target = cand
-                found_low = True
-                
-        if found_low and lowest_score < 0.4:
-            return lowest_target
-            
-        return self.rng.choice(candidates)
-
     def choose_statement(self, state: GameState, actor_id: int) -> Action:
 
-        my_role = role_of(state, actor_id)
+        my_role = self._roles_of(state)[actor_id]
         private = state.private_info[actor_id]
         
         # 1. Seer Strategy: Always claim Seer and report results
@@ -334,20 +432,18 @@ class SimpleStrategy:
         # 3. Wolf Strategy: Maybe claim Seer (Jump)
         if my_role == Role.WOLF:
             # Check if any teammate has claimed Seer in the past (History Check)
-            teammate_jumped = False
-            for e in state.public_events:
-                 if e.statement and e.statement.claimed_role == Role.SEER:
-                      # Check if the claimer was a wolf teammate
-                      if role_of(state, e.statement.actor_id) == Role.WOLF and e.statement.actor_id != actor_id:
-                           teammate_jumped = True
-                           break
+            wolf_mask = self._wolf_mask_of(state)
+            teammate_jumped = any(
+                pid != actor_id and (wolf_mask >> pid) & 1
+                for pid in self._derive(state).known_seers
+            )
             
             # Strategy Update: Single Jumper Policy
             # If a teammate has already jumped (alive or dead), other wolves should NOT jump.
             # This prevents "chain feeding" where wolves die one by one claiming Seer.
             if not teammate_jumped:
-                wolves = [p.player_id for p in alive_players(state) if p.role == Role.WOLF]
-                jumper_id = wolves[0] if wolves else -1
+                # The first living wolf jumps
+                jumper_id = next((p.player_id for p in self._derive(state).alive if p.role == Role.WOLF), -1)
                 
                 if actor_id == jumper_id:
                     return self._create_fake_seer_statement(state, actor_id)
@@ -361,6 +457,12 @@ class SimpleStrategy:
 
         # Villager / Hunter (Hidden) / Wolf (Hidden)
         
+        # Nothing to say unless someone is below 0.4; the living-player
+        # analysis can only find a score at least this low.
+        pass_action = Action(action_type=ActionType.SPEAK, actor_id=actor_id, statement=Statement(actor_id=actor_id, content="过"))
+        if min(private.trust_scores.values(), default=1.0) >= 0.4:
+            return pass_action
+        
         # Analyze Trust
         trust_analysis = self._analyze_trust_situation(state, actor_id)
         
@@ -387,18 +489,21 @@ class SimpleStrategy:
         if has_something_to_say and self.rng.random() < 0.6:
              return Action(action_type=ActionType.SPEAK, actor_id=actor_id, statement=Statement(actor_id=actor_id, content=speech_content))
              
-        return Action(action_type=ActionType.SPEAK, actor_id=actor_id, statement=Statement(actor_id=actor_id, content="过"))
+        return pass_action
 
     def _analyze_trust_situation(self, state: GameState, actor_id: int) -> Dict:
-        private = state.private_info[actor_id]
+        alive_mask = self._derive(state).alive_mask
+        trust = state.private_info[actor_id].trust_scores
         lowest_score = 1.0
         lowest_target = -1
         
-        for pid, score in private.trust_scores.items():
-            if get_player(state, pid).alive and pid != actor_id:
-                if score < lowest_score:
-                    lowest_score = score
-                    lowest_target = pid
+        # min() keeps the first of equal scores, in trust_scores order
+        others = [pid for pid in trust if pid != actor_id and (alive_mask >> pid) & 1]
+        if others:
+            pid = min(others, key=trust.__getitem__)
+            if trust[pid] < lowest_score:
+                lowest_score = trust[pid]
+                lowest_target = pid
                     
         return {
             'lowest_trust_target': lowest_target,
@@ -406,9 +511,17 @@ class SimpleStrategy:
         }
 
     def _choose_wolf_vote_target(self, state: GameState, actor_id: int) -> int:
-        alive = alive_players(state)
-        teammates = [p.player_id for p in alive if p.role == Role.WOLF]
-        non_wolves = [p.player_id for p in alive if p.role != Role.WOLF]
+        # Living players as bitmasks (bit pid set): wolves vs everyone else
+        teammate_mask = 0
+        non_wolf_mask = 0
+        non_wolves = []
+        for p in self._derive(state).alive:
+            if p.role == Role.WOLF:
+                teammate_mask |= 1 << p.player_id
+            else:
+                non_wolf_mask |= 1 << p.player_id
+                non_wolves.append(p.player_id)
+        alive_mask = teammate_mask | non_wolf_mask
         
         if not non_wolves: return actor_id # Should not happen
         
@@ -418,32 +531,31 @@ class SimpleStrategy:
         jumper_wolf = -1
         jumper_target = -1
         
+        d = self._derive(state)
         # Scan history for active Seer claim by teammate
-        for e in reversed(state.public_events):
+        for stmt in reversed(d.seer_claims):
             # Check latest claim in current or previous day
-            if e.statement and e.statement.claimed_role == Role.SEER:
-                speaker = e.statement.actor_id
-                if speaker in teammates and get_player(state, speaker).alive:
-                    jumper_wolf = speaker
-                    # Find who they accused (Kill check) or cleared (Gold Water)
-                    # Actually, if they accused someone, we vote that person.
-                    # If they cleared someone, we don't vote that person (usually).
-                    # But we need a target.
-                    # If Jumper accused X, X is priority target.
-                    for target, is_wolf in e.statement.claimed_checks.items():
-                        if is_wolf and get_player(state, target).alive:
-                            jumper_target = target
-                            break
-                    break
+            speaker = stmt.actor_id
+            if (teammate_mask >> speaker) & 1:
+                jumper_wolf = speaker
+                # Find who they accused (Kill check) or cleared (Gold Water)
+                # Actually, if they accused someone, we vote that person.
+                # If they cleared someone, we don't vote that person (usually).
+                # But we need a target.
+                # If Jumper accused X, X is priority target.
+                for target, is_wolf in stmt.claimed_checks.items():
+                    if is_wolf and (alive_mask >> target) & 1:
+                        jumper_target = target
+                        break
+                break
         
         # 2. Identify Real Seer (Enemy Seer)
         enemy_seer = -1
-        for e in reversed(state.public_events):
-            if e.statement and e.statement.claimed_role == Role.SEER:
-                speaker = e.statement.actor_id
-                if speaker not in teammates and get_player(state, speaker).alive:
-                    enemy_seer = speaker
-                    break
+        for stmt in reversed(d.seer_claims):
+            speaker = stmt.actor_id
+            if (non_wolf_mask >> speaker) & 1:
+                enemy_seer = speaker
+                break
         
         # 3. Decision Logic
         
@@ -463,32 +575,26 @@ class SimpleStrategy:
             return enemy_seer
             
         # Priority D: Kill other Gods (Witch/Hunter) if revealed
-        known_gods = []
-        for e in state.public_events:
-            if e.statement and e.statement.claimed_role in [Role.WITCH, Role.HUNTER]:
-                claimer = e.statement.actor_id
-                if claimer in non_wolves and get_player(state, claimer).alive:
-                     known_gods.append(claimer)
+        known_gods = [pid for pid in d.known_gods if (non_wolf_mask >> pid) & 1]
         
         if known_gods:
             return known_gods[0]
             
         # Priority E: Consistency with self-speech (if I accused someone)
-        for e in reversed(state.public_events):
-            if e.day == state.day and e.actor_id == actor_id and e.statement:
-                import re
-                content = e.statement.content
-                match = re.search(r"(我觉得|我怀疑|认出|认为|建议查杀).*?(\d+)", content)
-                if not match:
-                    match = re.search(r"(\d+).*?(是狼|铁狼|悍跳|可疑)", content)
-                
+        days = state.event_days
+        actor_ids = state.event_actor_ids
+        for i in range(len(days) - 1, -1, -1):
+            if days[i] != state.day:
+                break  # Events are in day order; nothing from today remains
+            if actor_ids[i] != actor_id:
+                continue
+            e = state.public_events[i]
+            if e.statement:
+                match = _SPEECH_RE.search(e.statement.content)
                 if match:
-                    for group in match.groups():
-                        if group.isdigit():
-                            suspect = int(group)
-                            if get_player(state, suspect).alive:
-                                return suspect
-                            break
+                    suspect = int(match.group(1) or match.group(2))
+                    if (alive_mask >> suspect) & 1:
+                        return suspect
 
         # Priority F: Random Villager
         return self.rng.choice(non_wolves)
@@ -500,12 +606,11 @@ class SimpleStrategy:
         if private.witch_state.save_used:
             saved_target = None
             save_day = -1
-            # Scan history in reverse to find when save was used
-            for e in reversed(state.public_events):
-                if e.actor_id == actor_id and "使用了解药" in e.description:
-                    saved_target = e.target_id
-                    save_day = e.day
-                    break
+            # Latest save in history
+            e = self._derive(state).witch_saves.get(actor_id)
+            if e is not None:
+                saved_target = e.target_id
+                save_day = e.day
             
             if saved_target is not None:
                 # Logic: Only report save if it happened last night (Day = current Day) or if I am claiming for the first time?
@@ -525,11 +630,10 @@ class SimpleStrategy:
         if private.witch_state.poison_used:
             poisoned_target = None
             poison_day = -1
-            for e in reversed(state.public_events):
-                if e.actor_id == actor_id and "使用了毒药" in e.description:
-                    poisoned_target = e.target_id
-                    poison_day = e.day
-                    break
+            e = self._derive(state).witch_poisons.get(actor_id)
+            if e is not None:
+                poisoned_target = e.target_id
+                poison_day = e.day
             
             if poisoned_target is not None:
                 if poison_day == state.day:
@@ -560,46 +664,44 @@ class SimpleStrategy:
         return Action(action_type=ActionType.SPEAK, actor_id=actor_id, statement=stmt)
 
     def _create_fake_seer_statement(self, state: GameState, actor_id: int) -> Action:
+        alive_mask = self._derive(state).alive_mask
         # Improved Fake Seer Strategy (User Request Optimized)
         # 1. Avoid accusing known Gods (Witch/Hunter/Silver Water) - unless desperate.
         # 2. Prioritize accusing Unknown players (to push Kill).
         # 3. Or give Gold Water to Teammates (to bond/protect).
         
-        alive = alive_players(state)
-        teammates = [p.player_id for p in alive if p.role == Role.WOLF]
+        alive = self._derive(state).alive
         
+        d = self._derive(state)
         # History Check: What have I claimed before?
-        my_claimed_checks = {}
-        for e in state.public_events:
-             if e.statement and e.statement.actor_id == actor_id and e.statement.claimed_role == Role.SEER:
-                 my_claimed_checks.update(e.statement.claimed_checks)
+        # Bit pid set <=> I already claimed to have checked pid
+        claimed_mask = 0
+        for stmt in d.seer_claims_by_player.get(actor_id, ()):
+            for pid in stmt.claimed_checks:
+                claimed_mask |= 1 << pid
 
         # Identify Known Good / Gods to AVOID accusing
-        known_good_identities = set()
-        for e in state.public_events:
-            if e.statement and e.statement.claimed_role in [Role.WITCH, Role.HUNTER]:
-                claimer = e.statement.actor_id
-                if get_player(state, claimer).alive:
-                     known_good_identities.add(claimer)
-            if e.statement and e.statement.claimed_role == Role.WITCH:
-                 import re
-                 match = re.search(r"救了\s*(\d+)", e.statement.content)
-                 if match:
-                     saved_id = int(match.group(1))
-                     known_good_identities.add(saved_id)
-
-        # Filter Unknowns: Alive - Teammates - Known Good - Self - Already Checked
+        known_good_identities = {pid for pid in d.known_gods if (alive_mask >> pid) & 1}
+        known_good_identities |= d.saved_ids
+
+        # One pass over the living (minus self and already checked):
+        # unchecked teammates can get Gold Water; Unknowns exclude Known Good.
+        gold_candidates = []
         unknowns = []
         for p in alive:
             pid = p.player_id
-            if pid != actor_id and pid not in teammates and pid not in known_good_identities and pid not in my_claimed_checks:
+            if pid == actor_id or (claimed_mask >> pid) & 1:
+                continue
+            if p.role == Role.WOLF:
+                gold_candidates.append(pid)
+            elif pid not in known_good_identities:
                 unknowns.append(pid)
         
         # Decision Logic
         target = -1
         is_wolf = False
         
-        can_gold_teammate = len([t for t in teammates if t != actor_id and t not in my_claimed_checks]) > 0
+        can_gold_teammate = len(gold_candidates) > 0
         can_accuse_unknown = len(unknowns) > 0
         
         rand_val = self.rng.random()
@@ -607,10 +709,8 @@ class SimpleStrategy:
         # Strategy 1: Gold Water Teammate (40%)
         # "发金水给队友以拉拢支持"
         if can_gold_teammate and (rand_val < 0.4 or not can_accuse_unknown):
-            candidates = [t for t in teammates if t != actor_id and t not in my_claimed_checks]
-            if candidates:
-                target = self.rng.choice(candidates)
-                is_wolf = False
+            target = self.rng.choice(gold_candidates)
+            is_wolf = False
         
         # Strategy 2: Accuse Unknown (40%)
         # "查杀一个身份不明的玩家"
@@ -628,7 +728,7 @@ class SimpleStrategy:
         if target == -1:
              # Must check someone. Known Gods? Or Dead people (fake check)?
              # Check a known God as Wolf (last resort)
-             candidates = [p.player_id for p in alive if p.player_id != actor_id and p.player_id not in my_claimed_checks]
+             candidates = [p.player_id for p in alive if p.player_id != actor_id and not (claimed_mask >> p.player_id) & 1]
              if candidates:
                  target = self.rng.choice(candidates)
                  # If they are known good, we must accuse them to have a chance?
@@ -652,27 +752,36 @@ class SimpleStrategy:
     def update_beliefs(self, state: GameState, statement: Statement):
         # Update trust scores for ALL players based on this statement
         speaker = statement.actor_id
+        private_info = state.private_info
         
         # Initialize trust if empty (0.5 default)
         for p in state.players:
-            if p.player_id not in state.private_info: continue
-            if speaker not in state.private_info[p.player_id].trust_scores:
-                state.private_info[p.player_id].trust_scores[speaker] = 0.5
+            private = private_info.get(p.player_id)
+            if private is not None and speaker not in private.trust_scores:
+                private.set_trust(speaker, 0.5)
+        
+        # Only Witch and Seer claims move anyone's beliefs
+        if statement.claimed_role not in (Role.WITCH, Role.SEER):
+            return
+        roles = self._roles_of(state)
+        alive = self._derive(state).alive
         
         # 1. If speaker claims Witch and reveals saved person (Silver Water)
         if statement.claimed_role == Role.WITCH:
-            # First, update known witches
-            for observer in state.players:
-                if not observer.alive: continue
-                private = state.private_info[observer.player_id]
-                if speaker not in private.known_witches:
-                    private.known_witches.append(speaker)
-            
             # Parse content for "saved X"
-            import re
-            match = re.search(r"救了\s*(\d+)", statement.content)
-            if match:
-                saved_target = int(match.group(1))
+            match = _SAVED_RE.search(statement.content)
+            saved_target = int(match.group(1)) if match else None
+            
+            # One pass per observer: record the claim, then (if a save was reported) weigh it
+            for observer in alive:
+                observer_id = observer.player_id
+                private = private_info[observer_id]
+                if not (private.known_witches_mask >> speaker) & 1:
+                    private.known_witches.append(speaker)
+                    private.known_witches_mask |= 1 << speaker
+                
+                if saved_target is None:
+                    continue
                 
                 # Everyone (except Wolves who know truth) should trust the saved person (Silver Water)
                 # But only if they trust the Witch claimer?
@@ -680,86 +789,83 @@ class SimpleStrategy:
                 # actually observers don't know who was saved at night.
                 # But Silver Water is usually regarded as Good.
                 
-                for observer in state.players:
-                    if not observer.alive: continue
-                    observer_id = observer.player_id
-                    private = state.private_info[observer_id]
-                    
-                    # Witch Credibility Logic:
-                    # If only one Witch claimer -> High Trust (0.9)
-                    # If multiple -> Low Trust (0.4) for all
-                    
-                    is_believed_witch = False
-                    if len(private.known_witches) == 1 and private.known_witches[0] == speaker:
-                        is_believed_witch = True
-                        private.trust_scores[speaker] = 0.9
-                    else:
-                        # Conflict
-                        for w in private.known_witches:
-                            private.trust_scores[w] = 0.4
-                    
-                    # If I am Wolf, I know if target is good or bad (usually good if Wolves killed them).
-                    # If I am Good, I should trust the Silver Water highly.
-                    if observer.role != Role.WOLF:
-                        if is_believed_witch:
-                            # Trust the Silver Water
-                            private.trust_scores[saved_target] = 0.9 # Very high trust
-                            private.believed_silver_water = saved_target
-                            
-                            # Also trust the Witch claimer? 
-                            # Unless countered by another Witch.
-                            # For now, boost Witch trust slightly.
-                            if observer_id != speaker:
-                                current_witch_trust = private.trust_scores.get(speaker, 0.5)
-                                private.trust_scores[speaker] = min(1.0, current_witch_trust + 0.2)
+                # Witch Credibility Logic:
+                # If only one Witch claimer -> High Trust (0.9)
+                # If multiple -> Low Trust (0.4) for all
+                
+                is_believed_witch = False
+                if len(private.known_witches) == 1 and private.known_witches[0] == speaker:
+                    is_believed_witch = True
+                    private.set_trust(speaker, 0.9)
+                else:
+                    # Conflict
+                    for w in private.known_witches:
+                        private.set_trust(w, 0.4)
+                
+                # If I am Wolf, I know if target is good or bad (usually good if Wolves killed them).
+                # If I am Good, I should trust the Silver Water highly.
+                if observer.role != Role.WOLF:
+                    if is_believed_witch:
+                        # Trust the Silver Water
+                        private.set_trust(saved_target, 0.9) # Very high trust
+                        private.believed_silver_water = saved_target
+                        
+                        # Also trust the Witch claimer? 
+                        # Unless countered by another Witch.
+                        # For now, boost Witch trust slightly.
+                        if observer_id != speaker:
+                            private.add_trust(speaker, 0.2)
 
         # If speaker claims Seer
 
 
         if statement.claimed_role == Role.SEER:
-            for observer in state.players:
-                if not observer.alive: continue
+            speaker_is_wolf = roles[speaker] == Role.WOLF
+            claimed_checks = statement.claimed_checks
+            last_statement = state.last_statement_by_role
+            for observer in alive:
                 observer_id = observer.player_id
-                private = state.private_info[observer_id]
+                private = private_info[observer_id]
                 
                 # 1. If I am Seer, Speaker is Wolf (Trust = 0)
                 if observer.role == Role.SEER and speaker != observer_id:
-                    private.trust_scores[speaker] = 0.0
+                    private.set_trust(speaker, 0.0)
                     
                 # 2. If I am Wolf, I know truth. If Speaker is Wolf teammate, Trust=1. If Good, Trust=0.
                 if observer.role == Role.WOLF:
-                    if role_of(state, speaker) == Role.WOLF:
-                        private.trust_scores[speaker] = 1.0
+                    if speaker_is_wolf:
+                        private.set_trust(speaker, 1.0)
                     else:
-                        private.trust_scores[speaker] = 0.0
+                        private.set_trust(speaker, 0.0)
                         
                 # 3. If I am Villager/Witch/Hunter
-                if observer.role in [Role.VILLAGER, Role.WITCH, Role.HUNTER]:
+                if observer.role in (Role.VILLAGER, Role.WITCH, Role.HUNTER):
                     # If this is the first Seer claim, tentatively trust (0.6)
                     # If there are multiple Seer claims, reduce trust for all claimants (0.4)
                     
                     # Track known seers
-                    if speaker not in private.known_seers:
+                    if not (private.known_seers_mask >> speaker) & 1:
                         private.known_seers.append(speaker)
+                        private.known_seers_mask |= 1 << speaker
                     
                     if len(private.known_seers) == 1:
-                        private.trust_scores[speaker] = 0.7 # High trust if only one
+                        private.set_trust(speaker, 0.7) # High trust if only one
                     else:
                         # Conflict! Lower trust for all claimants
                         # But we should try to evaluate based on other info?
                         # For now, default to suspicion for both.
                         for claimer in private.known_seers:
-                            private.trust_scores[claimer] = 0.4 # Suspicious
+                            private.set_trust(claimer, 0.4) # Suspicious
                         
                         # However, if I am Witch, and one of them is my Silver Water, I TRUST HIM.
                         if observer.role == Role.WITCH and private.witch_state.saved_player_id is not None:
                             saved = private.witch_state.saved_player_id
-                            if saved in private.known_seers:
-                                private.trust_scores[saved] = 0.9 # Trust Silver Water
+                            if (private.known_seers_mask >> saved) & 1:
+                                private.set_trust(saved, 0.9) # Trust Silver Water
                                 # Distrust the other(s)
                                 for claimer in private.known_seers:
                                     if claimer != saved:
-                                        private.trust_scores[claimer] = 0.1 # Fake Seer
+                                        private.set_trust(claimer, 0.1) # Fake Seer
                         
                         # GENERAL LOGIC: If a Seer candidate checked a known "Silver Water" as Good (and that Silver Water is not themselves),
                         # and another candidate checked Silver Water as Bad (or didn't check),
@@ -768,118 +874,114 @@ class SimpleStrategy:
                         if private.believed_silver_water is not None:
                             silver = private.believed_silver_water
                             for claimer in private.known_seers:
-                                # Find claimer's statement
-                                for e in reversed(state.public_events):
-                                    if e.statement and e.statement.actor_id == claimer and e.statement.claimed_role == Role.SEER:
-                                        # Did they check silver?
-                                        if silver in e.statement.claimed_checks:
-                                            is_wolf = e.statement.claimed_checks[silver]
-                                            if not is_wolf:
-                                                # Validated Silver Water!
-                                                private.trust_scores[claimer] = min(1.0, private.trust_scores.get(claimer, 0.5) + 0.4)
-                                            else:
-                                                # Accused Silver Water! Fake!
-                                                private.trust_scores[claimer] = 0.0
-                                        break
+                                # Find claimer's latest statement
+                                latest = last_statement.get((claimer, Role.SEER))
+                                if latest is None:
+                                    continue
+                                checks = latest.claimed_checks
+                                # Did they check silver?
+                                if silver in checks:
+                                    if not checks[silver]:
+                                        # Validated Silver Water!
+                                        private.add_trust(claimer, 0.4)
+                                    else:
+                                        # Accused Silver Water! Fake!
+                                        private.set_trust(claimer, 0.0)
 
                             
                 # 4. Check Result Logic
                 # If speaker says "X is Wolf" and I know X is Good (e.g. X is me), then Speaker is Wolf.
-                for target, is_wolf in statement.claimed_checks.items():
-                    if target == observer_id:
-                        # He checked me!
-                        real_me_is_wolf = (observer.role == Role.WOLF)
-                        if is_wolf != real_me_is_wolf:
-                            # He lied about me!
-                            private.trust_scores[speaker] = 0.0
-
-    def update_trust_after_vote(self, state: GameState, votes: Dict[str, int]):
-        # votes is mapping: voter_id_str -> target_id_int
-        
-        for voter_str, target_id in votes.items():
-            voter_id = int(voter_str)
-            voter = get_player(state, voter_id)
-            
-            for observer in state.players:
-                if not observer.alive: continue
-                observer_id = observer.player_id
+                is_wolf = claimed_checks.get(observer_id)
+                if is_wolf is not None:
+                    # He checked me!
+                    real_me_is_wolf = (observer.role == Role.WOLF)
+                    if is_wolf != real_me_is_wolf:
+                        # He lied about me!
+                        private.set_trust(speaker, 0.0)
+
+    def update_trust_after_vote(self, state: GameState, votes: Dict[int, int]):
+        # votes is mapping: voter_id -> target_id, both ints (as in the simulator's vote_map)
+        wolf_mask = self._wolf_mask_of(state)
+        all_mask = 0
+        for pid in self._roles_of(state):
+            all_mask |= 1 << pid
+        private_info = state.private_info
+        
+        # What each observer knows does not change during the vote round, so fold
+        # Logic 2 / 2.1 / 2.2 / 4 into bitsets once instead of per (voter, observer).
+        observers = []
+        for observer in self._derive(state).alive:
+            observer_id = observer.player_id
+            private = private_info[observer_id]
+            is_wolf = observer.role == Role.WOLF
+            known_wolves = 0
+            known_good = 0
+            # If target is observer self, role is known
+            if is_wolf:
+                # If observer is Wolf, they know teammates
+                known_wolves = wolf_mask
+                known_good = all_mask & ~wolf_mask
+            else:
+                known_good = 1 << observer_id
+                # If observer is Seer, they might have checked target
+                if observer.role == Role.SEER:
+                    known_wolves = private.seer_wolves_mask
+                    known_good |= private.seer_checked_mask & ~known_wolves
+            # Logic 2.1: Voting for Silver Water (Known Good by Witch)
+            # Logic 2.2: Voting for known Silver Water (if revealed)
+            for silver in (private.witch_state.saved_player_id if observer.role == Role.WITCH else None,
+                           private.believed_silver_water):
+                if silver is not None:
+                    known_wolves &= ~(1 << silver)
+                    known_good |= 1 << silver
+            # Logic 4: a Seer knows which voters are Wolves
+            voter_wolves = private.seer_wolves_mask if observer.role == Role.SEER else 0
+            observers.append((observer_id, private, is_wolf, known_wolves, known_good, voter_wolves))
+        
+        for voter_id, target_id in votes.items():
+            for observer_id, private, is_wolf, known_wolves, known_good, voter_wolves in observers:
                 if observer_id == voter_id: continue
                 
-                private = state.private_info[observer_id]
-                trust = private.trust_scores.get(voter_id, 0.5)
+                trust = private.get_trust(voter_id)
                 
                 # Logic 1: Self-Defense
                 # If voter voted for me (observer), I trust them less.
                 if target_id == observer_id:
                     # If I am good, they are attacking me.
-                    if observer.role != Role.WOLF:
+                    if not is_wolf:
                         trust -= 0.3
                     # If I am Wolf, well, they are still attacking me.
                     else:
                         trust -= 0.1 # Less impact as Wolf knows enemies
                         
                 # Logic 2: Voting for known Good/Bad
-                # Does observer know target's role?
-                target_role_known = None
-                
-                # If target is observer self, role is known
-                if target_id == observer_id:
-                    target_role_known = observer.role
-                # If observer is Wolf, they know teammates
-                elif observer.role == Role.WOLF:
-                    target_role_known = role_of(state, target_id)
-                # If observer is Seer, they might have checked target
-                elif observer.role == Role.SEER:
-                    if target_id in private.seer_results:
-                        is_wolf = private.seer_results[target_id]
-                        target_role_known = Role.WOLF if is_wolf else Role.VILLAGER # Generic Good
-                
-                # Logic 2.1: Voting for Silver Water (Known Good by Witch)
-                if observer.role == Role.WITCH and private.witch_state.saved_player_id == target_id:
-                    target_role_known = Role.VILLAGER # Silver Water is Good
-                
-                # Logic 2.2: Voting for known Silver Water (if revealed)
-                # If observer trusts Silver Water, and voter votes FOR Silver Water -> Bad.
-                if private.believed_silver_water == target_id:
-                    target_role_known = Role.VILLAGER
-                
-                if target_role_known:
-                    if target_role_known == Role.WOLF:
-                        # Voter voted for known Wolf -> Voter likely Good
-                        trust += 0.1
-                    else:
-                        # Voter voted for known Good -> Voter likely Bad
-                        trust -= 0.2
+                if (known_wolves >> target_id) & 1:
+                    # Voter voted for known Wolf -> Voter likely Good
+                    trust += 0.1
+                elif (known_good >> target_id) & 1:
+                    # Voter voted for known Good -> Voter likely Bad
+                    trust -= 0.2
                 
                 # Logic 3: Attack on Silver Water (General)
                 # If someone votes for the Silver Water (and I know who it is), they are suspicious.
                 # Already covered by Logic 2.1 and 2.2 if I know Silver Water.
                 
                 # Logic 4: Follow the Wolf? (If I know X is Wolf, and X votes Y, Y might be Good)
-                # If observer knows voter is Wolf
-                voter_role_known = None
-                if observer.role == Role.SEER and voter_id in private.seer_results:
-                    is_wolf = private.seer_results[voter_id]
-                    if is_wolf: voter_role_known = Role.WOLF
-                
-                if voter_role_known == Role.WOLF:
+                if (voter_wolves >> voter_id) & 1:
                     # Wolf voting for someone. Target is likely Good.
                     # Increase trust for target (not voter)
-                    target_trust = private.trust_scores.get(target_id, 0.5)
-                    target_trust += 0.1
-                    private.trust_scores[target_id] = min(1.0, target_trust)
+                    private.add_trust(target_id, 0.1)
 
-                # Clamp trust
-                trust = max(0.0, min(1.0, trust))
-                private.trust_scores[voter_id] = trust
+                private.set_trust(voter_id, trust)
 
     def choose_vote_target(self, state: GameState, actor_id: int) -> int:
+        alive_mask = self._derive(state).alive_mask
 
         private = state.private_info[actor_id]
-        my_role = role_of(state, actor_id)
+        my_role = self._roles_of(state)[actor_id]
         
         # 1. Trust known facts (Seer results)
-        known_wolves = [pid for pid, is_wolf in private.seer_results.items() if is_wolf and get_player(state, pid).alive]
+        known_wolves = [pid for pid, is_wolf in private.seer_results.items() if is_wolf and (alive_mask >> pid) & 1]
         if known_wolves:
             return known_wolves[0]
             
@@ -896,7 +998,7 @@ class SimpleStrategy:
         # If there are multiple Seers, pick a side.
         
         # Find alive Seer candidates
-        alive_seers = [pid for pid in private.known_seers if get_player(state, pid).alive]
+        alive_seers = [pid for pid in private.known_seers if (alive_mask >> pid) & 1]
         
         if len(alive_seers) > 1:
             # We have a conflict.
@@ -915,16 +1017,12 @@ class SimpleStrategy:
                     trusted_seer = silver
                 
                 # Check consistency with Silver Water
+                cleared_masks = state.seer_cleared_masks
                 for seer in alive_seers:
                     # If this Seer verified Silver Water as Good, trust them more.
-                    # Scan history
-                    for e in reversed(state.public_events):
-                        if e.statement and e.statement.actor_id == seer and e.statement.claimed_role == Role.SEER:
-                            if silver in e.statement.claimed_checks:
-                                is_wolf = e.statement.claimed_checks[silver]
-                                if not is_wolf:
-                                    trusted_seer = seer # Found a logical match
-                                    break
+                    if (cleared_masks.get(seer, 0) >> silver) & 1:
+                        trusted_seer = seer # Found a logical match
+                        break
                     if trusted_seer: break
             
             if trusted_seer:
@@ -949,7 +1047,7 @@ class SimpleStrategy:
                 
         # 5. Trust scores (For Good Guys)
         # Find alive player with lowest trust score
-        candidates = [p.player_id for p in alive_players(state) if p.player_id != actor_id]
+        candidates = [p.player_id for p in self._derive(state).alive if p.player_id != actor_id]
         
         # Filter candidates for Witch
         if my_role == Role.WITCH and private.witch_state.saved_player_id is not None:
@@ -958,36 +1056,25 @@ class SimpleStrategy:
         
         if not candidates: return actor_id
         
-        lowest_trust = 1.0
-        target = self.rng.choice(candidates) # Default random
-        
-        for cand in candidates:
-            # Default trust is 0.5. If I am Witch, I don't know who is Wolf, so 0.5.
-            score = private.trust_scores.get(cand, 0.5)
-            
-            # Special Logic: Gold Water (Good Guy) should not vote for their Seer?
-            # If I am Good, and Seer X checked me as Good. I should trust Seer X more.
-            # This is handled in update_beliefs (trust Seer who checked me).
-            # But here, if I trust someone highly (score > 0.8), I should NOT vote them.
-            
-            if score < lowest_trust:
-                lowest_trust = score
-                target = cand
-            elif score == lowest_trust:
-                if self.rng.random() < 0.5:
-                    target = cand
-                    
-        return target
+        # Default trust is 0.5. If I am Witch, I don't know who is Wolf, so 0.5.
+        # Special Logic: Gold Water (Good Guy) should not vote for their Seer?
+        # If I am Good, and Seer X checked me as Good. I should trust Seer X more.
+        # This is handled in update_beliefs (trust Seer who checked me).
+        trust_of = private.get_trust
+        lowest_trust = min(trust_of(cand) for cand in candidates)
+        # Uniform pick among the candidates tied at the lowest score
+        k = self._collect(cand for cand in candidates if trust_of(cand) == lowest_trust)
+        return self._pick(k)
 
 
 
 
 
     def choose_hunter_shot(self, state: GameState, actor_id: int) -> Optional[int]:
-        candidates = [p.player_id for p in alive_players(state) if p.player_id != actor_id]
-        if not candidates:
+        k = self._collect(p.player_id for p in self._derive(state).alive if p.player_id != actor_id)
+        if not k:
             return None
-        return self.rng.choice(candidates)
+        return self._pick(k)
 
     def recommend_action(self, state: GameState, actor_id: int) -> Action:
         # Deprecated: alias for backward compatibility or direct action use